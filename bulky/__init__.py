@@ -1,5 +1,78 @@
-from bulky.functions.insert import insert
-from bulky.functions.update import update
+"""
+Bulk operations on SQLAlchemy and PostgreSQL.
 
-__all__ = ("insert", "update")
+Functions and classes are imported on first access,
+so `import bulky` does not load SQLAlchemy, Jinja2 and DB drivers.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from bulky.checkpoints import (
+        CheckpointStore,
+        FileCheckpointStore,
+        TableCheckpointStore,
+    )
+    from bulky.functions.bulk_load import bulk_load
+    from bulky.functions.export import export
+    from bulky.functions.insert import insert
+    from bulky.functions.insert_graph import insert_graph
+    from bulky.functions.insert_resumable import insert_resumable
+    from bulky.functions.load_file import load_file
+    from bulky.functions.select import select
+    from bulky.functions.sync import sync
+    from bulky.functions.update import update
+    from bulky.internals.encoders import register_encoder
+    from bulky.stats import Stats
+
+# map: exported name -> module which defines it
+_modules = {
+    "CheckpointStore": "bulky.checkpoints",
+    "FileCheckpointStore": "bulky.checkpoints",
+    "Stats": "bulky.stats",
+    "TableCheckpointStore": "bulky.checkpoints",
+    "bulk_load": "bulky.functions.bulk_load",
+    "export": "bulky.functions.export",
+    "insert": "bulky.functions.insert",
+    "insert_graph": "bulky.functions.insert_graph",
+    "insert_resumable": "bulky.functions.insert_resumable",
+    "load_file": "bulky.functions.load_file",
+    "register_encoder": "bulky.internals.encoders",
+    "select": "bulky.functions.select",
+    "sync": "bulky.functions.sync",
+    "update": "bulky.functions.update",
+}
+
+__all__ = (
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "Stats",
+    "TableCheckpointStore",
+    "bulk_load",
+    "export",
+    "insert",
+    "insert_graph",
+    "insert_resumable",
+    "load_file",
+    "register_encoder",
+    "select",
+    "sync",
+    "update",
+)
 name = "bulky"
+
+
+def __getattr__(attr):
+    module_name = _modules.get(attr)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+    # __import__ rather than importlib, so that lazy imports are seen by -X importtime
+    value = getattr(__import__(module_name, fromlist=(attr,)), attr)
+    globals()[attr] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
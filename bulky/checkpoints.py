@@ -0,0 +1,128 @@
+import json
+import os
+from typing import Dict, Text
+
+import sqlalchemy as sa
+
+from bulky import consts
+from bulky.internals import sql
+from bulky.internals import utils
+
+
+class CheckpointStore:
+    """
+    Keeps the amount of committed rows of a resumable bulk operation.
+
+    Transactional stores save a checkpoint in the same transaction
+    as the chunks it covers, so the data and the checkpoint are committed atomically.
+    Non-transactional stores save a checkpoint right after the commit.
+    """
+
+    transactional = False
+
+    def load(self, conn, key: Text) -> int:
+        """
+        Returns the amount of rows already committed for given key
+
+        :param conn: SqlAlchemy connection owned by the operation
+        :param key: operation key
+        :return: amount of committed rows, 0 if nothing is committed
+        """
+
+        raise NotImplementedError
+
+    def save(self, conn, key: Text, offset: int) -> None:
+        """
+        Stores the amount of committed rows for given key
+
+        :param conn: SqlAlchemy connection owned by the operation
+        :param key: operation key
+        :param offset: amount of committed rows
+        """
+
+        raise NotImplementedError
+
+    def clear(self, conn, key: Text) -> None:
+        """
+        Forgets the checkpoint of given key
+
+        :param conn: SqlAlchemy connection
+        :param key: operation key
+        """
+
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints in a local JSON file.
+
+    The file is replaced atomically on each save.
+    A crash between a commit and a save makes the last committed chunks run again.
+    """
+
+    def __init__(self, path: Text):
+        self.path = path
+
+    def load(self, conn, key: Text) -> int:
+        return self._read().get(key, 0)
+
+    def save(self, conn, key: Text, offset: int) -> None:
+        checkpoints = self._read()
+        checkpoints[key] = offset
+        self._write(checkpoints)
+
+    def clear(self, conn, key: Text) -> None:
+        checkpoints = self._read()
+        checkpoints.pop(key, None)
+        self._write(checkpoints)
+
+    def _read(self) -> Dict[Text, int]:
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path) as src:
+            checkpoints: Dict[Text, int] = json.load(src)
+
+        return checkpoints
+
+    def _write(self, checkpoints: Dict[Text, int]) -> None:
+        path_tmp = f"{self.path}.tmp"
+
+        with open(path_tmp, "w") as dst:
+            json.dump(checkpoints, dst, sort_keys=True)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        os.replace(path_tmp, self.path)
+
+
+class TableCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints in a database table.
+
+    The table is created on the first use.
+    Checkpoints are saved in the transaction of the chunks they cover.
+    """
+
+    transactional = True
+
+    def __init__(self, table_name: Text = consts.CHECKPOINTS_TABLE_NAME):
+        self.table_name = table_name
+
+    def load(self, conn, key: Text) -> int:
+        self._execute(conn, sql.STMT_CREATE_CHECKPOINTS)
+        offset = self._execute(conn, sql.STMT_LOAD_CHECKPOINT, key=key).scalar()
+
+        return int(offset or 0)
+
+    def save(self, conn, key: Text, offset: int) -> None:
+        self._execute(conn, sql.STMT_SAVE_CHECKPOINT, key=key, offset=offset)
+
+    def clear(self, conn, key: Text) -> None:
+        self._execute(conn, sql.STMT_CREATE_CHECKPOINTS)
+        self._execute(conn, sql.STMT_CLEAR_CHECKPOINT, key=key)
+
+    def _execute(self, conn, template: Text, **params):
+        stmt = utils.get_template(template).render(table_name=self.table_name)
+        return conn.execute(sa.text(stmt), **params)
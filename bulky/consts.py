@@ -1,3 +1,49 @@
 BULK_CHUNK_SIZE = 10000
 
 NON_COMPARABLE_DB_TYPES = frozenset(("json",))
+
+PGCODE_SERIALIZATION_FAILURE = "40001"
+PGCODE_DEADLOCK_DETECTED = "40P01"
+PGCODE_LOCK_NOT_AVAILABLE = "55P03"
+
+RETRYABLE_PGCODES = frozenset(
+    (PGCODE_SERIALIZATION_FAILURE, PGCODE_DEADLOCK_DETECTED, PGCODE_LOCK_NOT_AVAILABLE)
+)
+
+RETRY_BACKOFF = 0.1
+RETRY_BACKOFF_MAX = 5.0
+
+CHECKPOINTS_TABLE_NAME = "bulky_checkpoints"
+
+RESUMABLE_COMMIT_EVERY = 10
+
+SYNC_INSERTED = "inserted"
+SYNC_UPDATED = "updated"
+SYNC_DELETED = "deleted"
+
+PIPELINE_DEPTH = 8
+
+PREFETCH_POLL_INTERVAL = 0.1
+
+EXPORT_FORMAT_TEXT = "text"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_BINARY = "binary"
+EXPORT_FORMAT_ROWS = "rows"
+
+EXPORT_FORMATS = frozenset(
+    (EXPORT_FORMAT_TEXT, EXPORT_FORMAT_CSV, EXPORT_FORMAT_BINARY, EXPORT_FORMAT_ROWS)
+)
+
+COPY_BUFFER_SIZE = 65536
+
+LOAD_FORMAT_CSV = "csv"
+LOAD_FORMAT_PARQUET = "parquet"
+
+LOAD_FORMATS = frozenset((LOAD_FORMAT_CSV, LOAD_FORMAT_PARQUET))
+
+PARQUET_SUFFIXES = frozenset((".parquet", ".pq"))
+
+LOCK_SKIP_LOCKED = "skip_locked"
+LOCK_NOWAIT = "nowait"
+
+LOCK_CLAUSES = {LOCK_SKIP_LOCKED: "SKIP LOCKED", LOCK_NOWAIT: "NOWAIT"}
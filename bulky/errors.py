@@ -20,3 +20,12 @@ class InvalidValueError(BulkOperationError):
             e += f": {message}"
 
         super().__init__(e)
+
+
+class ChunkExecutionError(BulkOperationError):
+    def __init__(self, index, message=""):
+        e = f"failed to execute chunk[{index}]"
+        if message:
+            e += f": {message}"
+
+        super().__init__(e)
@@ -0,0 +1,13 @@
+"""
+Expressions to update columns with, see `expressions` argument of `bulky.update`.
+
+In an expression, `{dst}` stands for the current value of column,
+and `{src}` stands for the value given in values_series, cast to column type.
+"""
+
+INCREMENT = "COALESCE({dst}, 0) + {src}"
+APPEND = "array_cat({dst}, {src})"
+COALESCE = "COALESCE({src}, {dst})"
+GREATEST = "GREATEST({dst}, {src})"
+LEAST = "LEAST({dst}, {src})"
+MERGE = "COALESCE({dst}, '{}'::jsonb) || {src}"
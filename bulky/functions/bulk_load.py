@@ -0,0 +1,131 @@
+import re
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Text, Tuple
+
+
+from bulky.internals import sql
+from bulky.internals import utils
+from bulky.types import SessionType, TableType
+
+_NOT_VALID = " NOT VALID"
+
+
+@contextmanager
+def bulk_load(
+    session: SessionType,
+    table_or_model: TableType,
+    concurrently: bool = False,
+    analyze: bool = True,
+) -> Iterator[None]:
+    """
+    Defers maintenance of secondary indexes and constraints during a bulk load.
+
+    Secondary indexes, foreign key and check constraints of the table are read
+    from the catalog and dropped on enter. On exit they are recreated
+    and the table is analyzed.
+
+    Primary key, unique and exclusion constraints are kept,
+    so conflicts are still detected during the load.
+
+    Indexes and constraints are dropped under a savepoint.
+    If the load fails, the savepoint is rolled back: dropped indexes and constraints
+    are restored and the loaded data are discarded.
+
+    :param session: SqlAlchemy session
+
+    :param table_or_model: a Table or Mapper or class inherited from declarative_base() call
+
+    :param concurrently: recreate indexes CONCURRENTLY and validate constraints separately,
+        without blocking writes to the table.
+        Session is committed on exit, since CONCURRENTLY can not run inside a transaction.
+
+    :param analyze: run ANALYZE on the table after indexes are recreated
+    """
+
+    table_name = utils.get_table_name(table_or_model)
+
+    conn = session.connection().execution_options(no_parameters=True)
+
+    indexes = _fetch(conn, sql.STMT_GET_SECONDARY_INDEXES, table_name)
+    constraints = _fetch(conn, sql.STMT_GET_DEFERRABLE_CONSTRAINTS, table_name)
+
+    conn.execute(sql.STMT_SAVEPOINT_LOAD)
+
+    try:
+        for name, _definition in constraints:
+            conn.execute(
+                utils.get_template(sql.STMT_DROP_CONSTRAINT).render(
+                    table_name=table_name, name=name
+                )
+            )
+
+        for name, _definition in indexes:
+            conn.execute(utils.get_template(sql.STMT_DROP_INDEX).render(name=name))
+
+        yield
+    except BaseException:
+        conn.execute(sql.STMT_ROLLBACK_TO_SAVEPOINT_LOAD)
+        conn.execute(sql.STMT_RELEASE_SAVEPOINT_LOAD)
+        raise
+
+    conn.execute(sql.STMT_RELEASE_SAVEPOINT_LOAD)
+
+    if not concurrently:
+        _restore(conn, table_name, indexes, constraints, False, analyze)
+        return
+
+    session.commit()
+
+    with closing(session.get_bind().connect()) as conn_autocommit:
+        conn_autocommit = conn_autocommit.execution_options(
+            isolation_level="AUTOCOMMIT", no_parameters=True
+        )
+        _restore(conn_autocommit, table_name, indexes, constraints, True, analyze)
+
+
+def _fetch(conn, template: Text, table_name: Text) -> List[Tuple[Text, Text]]:
+    stmt = utils.get_template(template).render(table_name=table_name)
+    rows = conn.execute(stmt).fetchall()
+
+    return [(row.name, row.definition) for row in rows]
+
+
+def _restore(
+    conn,
+    table_name: Text,
+    indexes: List[Tuple[Text, Text]],
+    constraints: List[Tuple[Text, Text]],
+    concurrently: bool,
+    analyze: bool,
+) -> None:
+    for _name, definition in indexes:
+        if concurrently:
+            definition = re.sub(
+                r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", definition
+            )
+
+        conn.execute(definition)
+
+    for name, definition in constraints:
+        was_valid = not definition.endswith(_NOT_VALID)
+        if not was_valid:
+            definition = definition[: -len(_NOT_VALID)]
+
+        conn.execute(
+            utils.get_template(sql.STMT_ADD_CONSTRAINT).render(
+                table_name=table_name,
+                name=name,
+                definition=definition,
+                not_valid=concurrently or not was_valid,
+            )
+        )
+
+        if concurrently and was_valid:
+            conn.execute(
+                utils.get_template(sql.STMT_VALIDATE_CONSTRAINT).render(
+                    table_name=table_name, name=name
+                )
+            )
+
+    if analyze:
+        conn.execute(utils.get_template(sql.STMT_ANALYZE).render(table_name=table_name))
@@ -0,0 +1,119 @@
+import codecs
+import io
+from typing import Any, Optional, Text
+
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import SelectBase
+from typeguard import typechecked
+
+from bulky import consts
+from bulky.internals import copy
+from bulky.internals import execution
+from bulky.internals import sql
+from bulky.internals import utils
+from bulky.types import ExportSourceType, ReturningType, SessionType
+
+
+@typechecked(always=True)
+def export(
+    session: SessionType,
+    table_or_model_or_select: ExportSourceType,
+    sink: Any,
+    format: Text = consts.EXPORT_FORMAT_CSV,
+    columns: Optional[ReturningType] = None,
+    header: bool = False,
+    batch_size: int = consts.BULK_CHUNK_SIZE,
+) -> int:
+    """
+    Streams rows of a table or a query out of DB with COPY ... TO STDOUT.
+
+    Data are passed to the sink as they arrive and are never accumulated,
+    so memory use does not depend on the size of the table.
+    The statement runs in the current transaction of session.
+
+    :param session: session from SqlAlchemy
+
+    :param table_or_model_or_select: a Table or Mapper or class inherited from declarative_base() call,
+        or a select / ORM query
+
+    :param sink: a file-like object with `write` method, or a callable.
+        A file opened in text mode receives strings, otherwise data are passed as bytes.
+
+    :param format: one of:
+        * "text", "csv", "binary": sink receives data in the COPY format;
+        * "rows": sink receives lists of up to `batch_size` tuples,
+            values are strings as printed by PostgreSQL, NULL is None.
+
+    :param columns: columns of a table to export, all columns by default.
+        Not applicable to queries.
+
+    :param header: write a header line, "csv" format only
+
+    :param batch_size: maximum amount of rows in a batch, "rows" format only
+
+    :return: amount of exported rows
+    """
+
+    if format not in consts.EXPORT_FORMATS:
+        raise ValueError(
+            f"unknown format {format!r}, expect one of {sorted(consts.EXPORT_FORMATS)}"
+        )
+
+    write = getattr(sink, "write", sink)
+    if not callable(write):
+        raise ValueError(f"sink {sink!r} is neither callable nor writable")
+
+    conn = session.connection()
+    dbapi_connection = conn.connection.connection
+    encoding = copy.get_encoding(dbapi_connection)
+
+    source = table_or_model_or_select
+    if isinstance(source, Query):
+        source = source.statement
+
+    if isinstance(source, SelectBase):
+        if columns:
+            raise ValueError("columns are not applicable to a query")
+
+        query = copy.mogrify(
+            dbapi_connection, *execution.compile_statement(conn, source)
+        )
+        table_name = None
+        columns_exported = []
+    else:
+        query = None
+        table = utils.get_table(source)
+        table_name = table.name
+        columns_exported = [
+            utils.get_column_key(table, column) for column in (columns or table.columns)
+        ]
+
+    stmt = utils.get_template(sql.STMT_COPY_TO).render(
+        query=query,
+        table_name=table_name,
+        columns=columns_exported,
+        format=(
+            consts.EXPORT_FORMAT_TEXT if format == consts.EXPORT_FORMAT_ROWS else format
+        ),
+        header=header,
+    )
+
+    if format == consts.EXPORT_FORMAT_ROWS:
+        reader = copy.TextRowsReader(encoding, batch_size, write)
+        rowcount = copy.copy_to(dbapi_connection, stmt, reader.write)
+        reader.close()
+
+        return rowcount
+
+    if isinstance(sink, io.TextIOBase):
+        if format == consts.EXPORT_FORMAT_BINARY:
+            raise ValueError("binary format requires a sink opened in binary mode")
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+
+        def write_text(data: bytes) -> None:
+            sink.write(decoder.decode(data))
+
+        return copy.copy_to(dbapi_connection, stmt, write_text)
+
+    return copy.copy_to(dbapi_connection, stmt, write)
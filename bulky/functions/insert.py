@@ -1,11 +1,17 @@
-from typing import Optional
+from typing import Optional, Union
 
 import sqlalchemy as sa
+from sqlalchemy import Table
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from typeguard import typechecked
 
 from bulky import consts
+from bulky import errors
+from bulky.internals import execution
 from bulky.internals import utils
 from bulky.types import (
+    InstancesSeriesType,
     ReturningType,
     RowsType,
     SessionType,
@@ -18,14 +24,16 @@ from bulky.types import (
 def insert(
     session: SessionType,
     table_or_model: TableType,
-    values_series: ValuesSeriesType,
+    values_series: Union[ValuesSeriesType, InstancesSeriesType],
     returning: Optional[ReturningType] = None,
+    attach: bool = False,
+    pipeline: bool = False,
 ) -> RowsType:
     """
     Inserts a series of values into DB.
 
     Data are split into chunks.
-    Chunks are inserted sequentially.
+    Chunks are inserted sequentially, or pipelined.
 
     No multiprocessing.
     No multithreading.
@@ -47,9 +55,20 @@ def insert(
         `column` may be:
             * a name of a table column;
             * a column attribute of a table / Mapper / Declarative;
+        Also may be a sequence of transient instances of the mapped class.
+        Their loaded column attributes are inserted,
+        missing primary keys are allocated from the sequence,
+        and all column values, including server-generated ones, are set back onto instances.
 
     :param returning: a sequence of elements representing table / Mapper / Declarative columns.
         These columns, bound with values, will be returned after insert.
+        For instances, rows with all columns are returned.
+
+    :param attach: add inserted instances to the session as persistent, without a flush
+
+    :param pipeline: send chunks in pipeline mode, if the connection is made by psycopg 3.
+        Several chunks are in flight at once, in the same transaction.
+        Other connections execute chunks sequentially.
 
     :return: a list of RowProxy.
         If either no data are inserted or no returning requested, empty list will be returned.
@@ -62,6 +81,11 @@ def insert(
 
     table = utils.get_table(table_or_model)
 
+    if utils.is_instances_series(values_series):
+        return _insert_instances(
+            session, table, values_series, returning, attach, pipeline
+        )
+
     returning_cleaned = utils.clean_returning(table, returning)
     values_series_cleaned = utils.clean_values(table, values_series)
 
@@ -70,12 +94,80 @@ def insert(
         for i in range(0, len(values_series_cleaned), consts.BULK_CHUNK_SIZE)
     )
 
-    for n_chunk, chunk in enumerate(values_series_chunks):
-        query = sa.insert(table, values=chunk, returning=returning_cleaned, inline=True)
-        query_result = session.execute(query)
+    queries = (
+        sa.insert(table, values=chunk, returning=returning_cleaned, inline=True)
+        for chunk in values_series_chunks
+    )
+
+    conn = session.connection()
+
+    for data in execution.execute_chunks(
+        conn, queries, bool(returning), pipeline=pipeline
+    ):
+        result.extend(data)
+
+    return result
+
+
+def _insert_instances(
+    session: SessionType,
+    table: Table,
+    instances: InstancesSeriesType,
+    returning: Optional[ReturningType],
+    attach: bool,
+    pipeline: bool,
+) -> RowsType:
+    result: RowsType = []
+
+    states = []
+
+    for values_index, instance in enumerate(instances):
+        state = utils.get_instance_state(table, instance, values_index)
+
+        if not state.transient:
+            raise errors.InvalidValueError(values_index, "instance is not transient")
+
+        states.append(state)
+
+    values_series = [utils.get_instance_values(state) for state in states]
+
+    primary_key = [column.key for column in table.primary_key.columns]
+
+    for column in primary_key:
+        values_missing = [
+            values for values in values_series if values.get(column) is None
+        ]
+        if not values_missing:
+            continue
+
+        allocated = utils.allocate_sequence_values(
+            session, table, column, len(values_missing)
+        )
+
+        for values, value in zip(values_missing, allocated):
+            values[column] = value
+
+    returning_all = [column.key for column in table.columns]
+
+    for states_group, values_group in utils.group_by_columns(states, values_series):
+        rows = insert(session, table, values_group, returning_all, pipeline=pipeline)
+
+        rows_by_key = {
+            tuple(row[column] for column in primary_key): row for row in rows
+        }
+
+        for state, values in zip(states_group, values_group):
+            row = rows_by_key[tuple(values[column] for column in primary_key)]
+            instance = state.obj()
+
+            for prop in state.mapper.column_attrs:
+                set_committed_value(instance, prop.key, row[prop.columns[0].key])
+
+            if attach:
+                make_transient_to_detached(instance)
+                session.add(instance)
 
         if returning:
-            data = query_result.fetchall()
-            result.extend(data)
+            result.extend(rows)
 
     return result
@@ -0,0 +1,185 @@
+from typing import Dict, List, Optional, Text, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapper, RelationshipProperty
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.interfaces import ONETOMANY
+from typeguard import typechecked
+
+from bulky import errors
+from bulky.functions.insert import insert
+from bulky.internals import utils
+from bulky.types import (
+    CleanedValuesSeriesType,
+    ReturningType,
+    RowsType,
+    SessionType,
+    TableType,
+    ValuesSeriesType,
+    ValuesType,
+)
+
+
+@typechecked(always=True)
+def insert_graph(
+    session: SessionType,
+    model: TableType,
+    values_series: ValuesSeriesType,
+    returning: Optional[ReturningType] = None,
+) -> RowsType:
+    """
+    Inserts a series of values with nested values of related models.
+
+    Nested values are given under relationship keys of the model
+    as a sequence of {column: value} dicts, which may nest values further.
+    Only one-to-many relationships are followed.
+
+    Values are inserted level by level: all rows of a model in bulk,
+    then all rows of its related models.
+    Keys of parent rows which are generated by a sequence are allocated
+    in one round trip before the parents are inserted,
+    and then propagated into foreign key columns of the children.
+
+    :param session: session from SqlAlchemy
+
+    :param model: a Mapper or class inherited from declarative_base() call
+
+    :param values_series: a sequence of values in {column or relationship: value} format.
+        `column` may be:
+            * a name of a table column;
+            * a column attribute of a Mapper / Declarative;
+        `relationship` may be:
+            * a name of a relationship;
+            * a relationship attribute of a Mapper / Declarative;
+
+    :param returning: a sequence of elements representing columns of model.
+        These columns, bound with values, will be returned for the top level rows.
+
+    :return: a list of RowProxy.
+        If either no data are inserted or no returning requested, empty list will be returned.
+    """
+
+    mapper = sa.inspect(model)
+
+    if not isinstance(mapper, Mapper):
+        raise ValueError(f"{model} is not mapped, unable to follow relationships")
+
+    return _insert_level(session, mapper, values_series, returning)
+
+
+def _insert_level(
+    session: SessionType,
+    mapper: Mapper,
+    values_series: ValuesSeriesType,
+    returning: Optional[ReturningType],
+) -> RowsType:
+    if not values_series:
+        return []
+
+    relationships = {rel.key: rel for rel in mapper.relationships}
+
+    values_series_own: List[ValuesType] = []
+    nested: Dict[Text, List[Tuple[int, ValuesSeriesType]]] = {}
+
+    for values_index, values in enumerate(values_series):
+        utils.validate_values(values, values_index)
+
+        values_own: ValuesType = {}
+
+        for key, value in values.items():
+            rel = _get_relationship(relationships, key)
+
+            if rel is None:
+                values_own[key] = value
+                continue
+
+            if rel.direction is not ONETOMANY or rel.secondary is not None:
+                raise errors.InvalidColumnError(
+                    rel.key,
+                    "only one-to-many relationships are supported",
+                    values_index,
+                )
+
+            if isinstance(value, dict):
+                value = [value]
+
+            nested.setdefault(rel.key, []).append((values_index, value or []))
+
+        values_series_own.append(values_own)
+
+    model = mapper.class_
+
+    values_series_cleaned = utils.clean_values(model, values_series_own)
+
+    if nested:
+        _populate_referenced_keys(session, mapper, values_series_cleaned, nested)
+
+    result = insert(session, model, values_series_cleaned, returning)
+
+    for rel_key, children_by_parent in nested.items():
+        rel = relationships[rel_key]
+
+        children: List[ValuesType] = []
+
+        for values_index, children_values_series in children_by_parent:
+            parent = values_series_cleaned[values_index]
+
+            for child_values in children_values_series:
+                child_values = dict(child_values)
+
+                for column_parent, column_child in rel.local_remote_pairs:
+                    child_values[column_child.key] = parent[column_parent.key]
+
+                children.append(child_values)
+
+        _insert_level(session, rel.mapper, children, None)
+
+    return result
+
+
+def _get_relationship(
+    relationships: Dict[Text, RelationshipProperty], key
+) -> Optional[RelationshipProperty]:
+    if isinstance(key, InstrumentedAttribute):
+        prop = key.property
+        if isinstance(prop, RelationshipProperty):
+            return prop
+
+        return None
+
+    if isinstance(key, Text):
+        return relationships.get(key)
+
+    return None
+
+
+def _populate_referenced_keys(
+    session: SessionType,
+    mapper: Mapper,
+    values_series: CleanedValuesSeriesType,
+    nested: Dict[Text, List[Tuple[int, ValuesSeriesType]]],
+) -> None:
+    """
+    Allocates values of parent columns referenced by children, if they are not given.
+    """
+
+    columns_given = frozenset(values_series[0].keys())
+
+    columns_referenced = sorted(
+        {
+            column_parent.key
+            for rel_key in nested
+            for column_parent, _column_child in mapper.relationships[
+                rel_key
+            ].local_remote_pairs
+        }
+        - columns_given
+    )
+
+    for column in columns_referenced:
+        allocated = utils.allocate_sequence_values(
+            session, mapper.class_, column, len(values_series)
+        )
+
+        for values, value in zip(values_series, allocated):
+            values[column] = value
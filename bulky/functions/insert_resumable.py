@@ -0,0 +1,99 @@
+from contextlib import closing
+from typing import Optional, Text
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from typeguard import typechecked
+
+from bulky import consts
+from bulky.checkpoints import CheckpointStore
+from bulky.internals import utils
+from bulky.types import ReturningType, RowsType, TableType, ValuesSeriesType
+
+
+@typechecked(always=True)
+def insert_resumable(
+    engine: Engine,
+    table_or_model: TableType,
+    values_series: ValuesSeriesType,
+    checkpoints: CheckpointStore,
+    key: Optional[Text] = None,
+    commit_every: int = consts.RESUMABLE_COMMIT_EVERY,
+    returning: Optional[ReturningType] = None,
+) -> RowsType:
+    """
+    Inserts a series of values into DB, committing periodically.
+
+    Data are split into chunks.
+    Chunks are inserted sequentially on a connection owned by this function.
+    A transaction is committed after each `commit_every` chunks,
+    and the amount of committed rows is saved into the checkpoint store.
+
+    A restart with the same values_series and key skips the rows
+    which are already committed.
+
+    :param engine: SqlAlchemy engine to take the connection from
+
+    :param table_or_model: a Table or Mapper or class inherited from declarative_base() call
+
+    :param values_series: a sequence of values in {column: value} format.
+        The order of values must be the same on every restart.
+
+    :param checkpoints: a store of committed offsets
+
+    :param key: a key of the operation in the checkpoint store.
+        Defaults to the table name.
+
+    :param commit_every: amount of chunks in one transaction
+
+    :param returning: a sequence of elements representing table / Mapper / Declarative columns.
+        These columns, bound with values, will be returned after insert.
+        Only rows inserted by this very call are returned.
+
+    :return: a list of RowProxy.
+        If either no data are inserted or no returning requested, empty list will be returned.
+    """
+
+    result: RowsType = []
+
+    if commit_every < 1:
+        raise ValueError(f"commit_every must be positive, got {commit_every}")
+
+    table = utils.get_table(table_or_model)
+    key = key or table.name
+
+    returning_cleaned = utils.clean_returning(table, returning)
+
+    with closing(engine.connect()) as conn:
+        with conn.begin():
+            offset = checkpoints.load(conn, key)
+
+        if offset >= len(values_series):
+            return result
+
+        values_series_cleaned = utils.clean_values(table, values_series[offset:])
+
+        rows_per_transaction = consts.BULK_CHUNK_SIZE * commit_every
+
+        for i in range(0, len(values_series_cleaned), rows_per_transaction):
+            batch = values_series_cleaned[i : i + rows_per_transaction]
+            offset_batch = offset + i + len(batch)
+
+            with conn.begin():
+                for j in range(0, len(batch), consts.BULK_CHUNK_SIZE):
+                    chunk = batch[j : j + consts.BULK_CHUNK_SIZE]
+                    query = sa.insert(
+                        table, values=chunk, returning=returning_cleaned, inline=True
+                    )
+                    query_result = conn.execute(query)
+
+                    if returning:
+                        result.extend(query_result.fetchall())
+
+                if checkpoints.transactional:
+                    checkpoints.save(conn, key, offset_batch)
+
+            if not checkpoints.transactional:
+                checkpoints.save(conn, key, offset_batch)
+
+    return result
@@ -0,0 +1,263 @@
+import csv
+import io
+import os
+from contextlib import ExitStack
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Text, Union
+
+from sqlalchemy import Table
+from typeguard import typechecked
+
+from bulky import consts
+from bulky.functions.sync import sync_staging
+from bulky.internals import copy
+from bulky.internals import sql
+from bulky.internals import staging as stg
+from bulky.internals import utils
+from bulky.types import (
+    ColumnType,
+    ReferenceType,
+    SessionType,
+    SyncResultType,
+    TableType,
+)
+
+
+@typechecked(always=True)
+def load_file(
+    session: SessionType,
+    table_or_model: TableType,
+    path: Union[Text, os.PathLike],
+    columns: Optional[Sequence[Text]] = None,
+    mapping: Optional[Dict[Text, Optional[ColumnType]]] = None,
+    reference: Optional[ReferenceType] = None,
+    format: Optional[Text] = None,
+    header: bool = True,
+    delimiter: Text = ",",
+    encoding: Text = "utf-8",
+) -> SyncResultType:
+    """
+    Loads rows from a CSV or Parquet file with COPY ... FROM STDIN.
+
+    The file is streamed in bounded chunks and is never materialized in Python:
+        * CSV is passed straight through, unless some of its columns are skipped;
+        * Parquet is read row group by row group, pyarrow is required.
+
+    Rows are inserted into the table.
+    If reference is given, rows are copied into a staging table first,
+    then rows which differ from the staged ones are updated
+    and the rest of staged rows are inserted.
+
+    :param session: session from SqlAlchemy
+
+    :param table_or_model: a Table or Mapper or class inherited from declarative_base() call
+
+    :param path: path to the file
+
+    :param columns: names of file columns.
+        For CSV, all columns in the order of file, read from the header by default.
+        For Parquet, columns to read, all columns by default.
+
+    :param mapping: a dict of {file column: table column}.
+        File columns absent in mapping are loaded into table columns with the same name.
+        Columns mapped to None are skipped.
+
+    :param reference: columns to identify rows for insert-or-update
+
+    :param format: "csv" or "parquet", detected by file suffix by default
+
+    :param header: CSV file starts with a header line
+
+    :param delimiter: delimiter of CSV fields
+
+    :param encoding: encoding of CSV file
+
+    :return: a dict of {action: amount of rows}, with "inserted", "updated" and "deleted" actions
+    """
+
+    table = utils.get_table(table_or_model)
+
+    path = os.fspath(path)
+
+    if format is None:
+        suffix = os.path.splitext(path)[1].lower()
+        is_parquet = suffix in consts.PARQUET_SUFFIXES
+        format = consts.LOAD_FORMAT_PARQUET if is_parquet else consts.LOAD_FORMAT_CSV
+
+    if format not in consts.LOAD_FORMATS:
+        raise ValueError(
+            f"unknown format {format!r}, expect one of {sorted(consts.LOAD_FORMATS)}"
+        )
+
+    with ExitStack() as stack:
+        if format == consts.LOAD_FORMAT_PARQUET:
+            try:
+                import pyarrow.parquet as pa_parquet
+            except ImportError:  # pragma: no cover
+                raise ImportError("pyarrow is required to load Parquet files")
+
+            parquet = pa_parquet.ParquetFile(path)
+            stack.callback(parquet.close)
+
+            columns_file = list(columns or parquet.schema_arrow.names)
+            columns_table = _map_columns(table, columns_file, mapping)
+            columns_read = [
+                column
+                for column, column_table in zip(columns_file, columns_table)
+                if column_table
+            ]
+
+            chunks = _read_parquet(parquet, columns_read)
+            delimiter = ","
+            encoding = "utf-8"
+        else:
+            file = stack.enter_context(open(path, "rb"))
+
+            columns_header = _read_header(file, delimiter, encoding) if header else []
+            columns_file = list(columns or columns_header)
+            if not columns_file:
+                raise ValueError(f"columns of {path} are unknown, no header is read")
+
+            columns_table = _map_columns(table, columns_file, mapping)
+
+            if all(columns_table):
+                chunks = _read_raw(file)
+            else:
+                chunks = _read_csv(file, columns_table, delimiter, encoding)
+
+        columns_loaded = [column for column in columns_table if column]
+
+        return _load(
+            session,
+            table,
+            chunks,
+            columns_loaded,
+            reference,
+            delimiter=delimiter,
+            encoding=encoding,
+        )
+
+
+def _load(
+    session: SessionType,
+    table: Table,
+    chunks: Iterator[bytes],
+    columns: List[Text],
+    reference: Optional[ReferenceType],
+    delimiter: Text,
+    encoding: Text,
+) -> SyncResultType:
+    result: SyncResultType = {
+        action: 0
+        for action in (consts.SYNC_INSERTED, consts.SYNC_UPDATED, consts.SYNC_DELETED)
+    }
+
+    dbapi_connection = session.connection().connection.connection
+
+    def copy_into(table_name: Text) -> int:
+        stmt = utils.get_template(sql.STMT_COPY_FROM).render(
+            table_name=table_name,
+            columns=columns,
+            delimiter=delimiter,
+            encoding=encoding,
+        )
+
+        return copy.copy_from(dbapi_connection, stmt, chunks)
+
+    if reference is None:
+        result[consts.SYNC_INSERTED] = copy_into(table.name)
+        return result
+
+    reference_fields = sorted(
+        frozenset(utils.get_column_key(table, f) for f in reference)
+    )
+
+    if set(reference_fields) - set(columns):
+        raise ValueError(
+            "reference field {rf} is not loaded into table {tbl}".format(
+                rf=reference_fields, tbl=table.name
+            )
+        )
+
+    with stg.staging_table(session, table, columns) as staging:
+        copy_into(staging.name)
+        stg.analyze(session, staging)
+
+        return sync_staging(
+            session, table, staging, columns, reference_fields, delete_missing=False
+        )
+
+
+def _map_columns(
+    table, columns_file: List[Text], mapping: Optional[Dict[Text, Optional[ColumnType]]]
+) -> List[Optional[Text]]:
+    """
+    Maps file columns to keys of table columns, None for skipped columns.
+    """
+
+    mapping = mapping or {}
+
+    return [
+        (
+            None
+            if mapping.get(column, column) is None
+            else utils.get_column_key(table, mapping.get(column, column))
+        )
+        for column in columns_file
+    ]
+
+
+def _read_header(file: BinaryIO, delimiter: Text, encoding: Text) -> List[Text]:
+    line = file.readline().decode(encoding)
+
+    return next(csv.reader([line], delimiter=delimiter), [])
+
+
+def _read_raw(file: BinaryIO) -> Iterator[bytes]:
+    while True:
+        chunk = file.read(consts.COPY_BUFFER_SIZE)
+        if not chunk:
+            break
+
+        yield chunk
+
+
+def _read_csv(
+    file: BinaryIO,
+    columns_table: List[Optional[Text]],
+    delimiter: Text,
+    encoding: Text,
+) -> Iterator[bytes]:
+    """
+    Reads CSV rows, keeping only the loaded columns.
+    """
+
+    indexes = [index for index, column in enumerate(columns_table) if column]
+
+    text = io.TextIOWrapper(file, encoding=encoding, newline="")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+
+    for row_index, row in enumerate(csv.reader(text, delimiter=delimiter), 1):
+        writer.writerow([row[index] for index in indexes])
+
+        if row_index % consts.BULK_CHUNK_SIZE == 0:
+            yield buffer.getvalue().encode(encoding)
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode(encoding)
+
+
+def _read_parquet(parquet, columns: List[Text]) -> Iterator[bytes]:
+    import pyarrow.csv as pa_csv
+
+    options = pa_csv.WriteOptions(include_header=False)
+
+    for index in range(parquet.num_row_groups):
+        row_group = parquet.read_row_group(index, columns=columns)
+
+        buffer = io.BytesIO()
+        pa_csv.write_csv(row_group, buffer, options)
+
+        yield buffer.getvalue()
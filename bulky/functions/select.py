@@ -0,0 +1,111 @@
+from typing import Iterator, List, Optional, Text
+
+
+from bulky import consts
+from bulky.internals import sql
+from bulky.internals import utils
+from bulky.types import (
+    CleanedValuesSeriesType,
+    ColumnTypesMapType,
+    KeysSeriesType,
+    ReferenceType,
+    ReturningType,
+    RowType,
+    SelectResultType,
+    SessionType,
+    TableType,
+)
+
+
+def select(
+    session: SessionType,
+    table_or_model: TableType,
+    keys_series: KeysSeriesType,
+    reference: ReferenceType = ("id",),
+    columns: Optional[ReturningType] = None,
+    as_dict: bool = False,
+) -> SelectResultType:
+    """
+    Fetches rows by a series of keys.
+
+    Keys are split into chunks.
+    Each chunk is matched against the table as a VALUES list,
+    and rows are streamed back chunk by chunk.
+
+    :param session: SQLAlchemy session
+    :param table_or_model: a table to fetch data from
+    :param keys_series: list of keys in {column: value} format, with reference columns only
+    :param reference: fields to identify rows
+    :param columns: columns to fetch, all columns by default
+    :param as_dict: return a dict of {reference tuple: row} instead of an iterator of rows.
+        Reference tuple consists of values in the order of `reference`.
+    :return: an iterator of rows, or a dict of rows
+    """
+
+    table = utils.get_table(table_or_model)
+
+    reference_fields = [utils.get_column_key(table, f) for f in reference]
+
+    columns_fetched = sorted(
+        {utils.get_column_key(table, column) for column in (columns or table.columns)}
+    )
+
+    if as_dict:
+        columns_fetched = sorted(set(columns_fetched) | set(reference_fields))
+
+    if not keys_series:
+        rows: Iterator[RowType] = iter(())
+    else:
+        column_types = utils.get_column_types(session, table)
+
+        keys_series = utils.clean_values(
+            table, keys_series, cast_db_types=True, column_types=column_types
+        )
+
+        if set(keys_series[0].keys()) != set(reference_fields):
+            raise ValueError(
+                "keys {keys} do not match reference {rf} in table {tbl}".format(
+                    keys=sorted(keys_series[0].keys()),
+                    rf=sorted(reference_fields),
+                    tbl=table.name,
+                )
+            )
+
+        rows = _iterate(
+            session,
+            table.name,
+            keys_series,
+            sorted(reference_fields),
+            columns_fetched,
+            column_types,
+        )
+
+    if as_dict:
+        return {tuple(row[column] for column in reference_fields): row for row in rows}
+
+    return rows
+
+
+def _iterate(
+    session: SessionType,
+    table_name: Text,
+    keys_series: CleanedValuesSeriesType,
+    reference_fields: List[Text],
+    columns: List[Text],
+    column_types: ColumnTypesMapType,
+) -> Iterator[RowType]:
+    conn = session.connection().execution_options(no_parameters=True)
+
+    for i in range(0, len(keys_series), consts.BULK_CHUNK_SIZE):
+        stmt = utils.get_template(sql.STMT_SELECT).render(
+            src="src",
+            dst=table_name,
+            columns=columns,
+            values_list=keys_series[i : i + consts.BULK_CHUNK_SIZE],
+            column_types=column_types,
+            reference_fields=reference_fields,
+        )
+
+        response = conn.execute(stmt)
+
+        yield from response.fetchall()
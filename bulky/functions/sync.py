@@ -0,0 +1,184 @@
+from typing import Optional, Sequence, Text
+
+import sqlalchemy as sa
+from typeguard import typechecked
+
+from bulky import consts
+from bulky.internals import staging as stg
+from bulky.internals import utils
+from bulky.types import (
+    ReferenceType,
+    ReturningType,
+    ScopeType,
+    SessionType,
+    SyncResultType,
+    TableType,
+    ValuesSeriesType,
+)
+
+
+@typechecked(always=True)
+def sync(
+    session: SessionType,
+    table_or_model: TableType,
+    values_series: ValuesSeriesType,
+    reference: ReferenceType = ("id",),
+    delete_missing: bool = True,
+    scope: Optional[ScopeType] = None,
+    returning: Optional[ReturningType] = None,
+) -> SyncResultType:
+    """
+    Makes the table match a series of values.
+
+    Values are staged once in a temporary table.
+    Then the rows are synced with three set operations against the staging table:
+        * rows which differ from staged ones are updated;
+        * staged rows which are absent in the table are inserted;
+        * rows which are absent in the staging table are deleted.
+
+    Rows are matched by reference, which must be unique in values_series.
+
+    Session is not flushed.
+    Default values on SqlAlchemy level are resolved and populated implicitly for inserted rows.
+
+    :param session: session from SqlAlchemy
+
+    :param table_or_model: a Table or Mapper or class inherited from declarative_base() call
+
+    :param values_series: a sequence of values in {column: value} format
+
+    :param reference: columns to identify rows
+
+    :param delete_missing: delete rows which are absent in values_series
+
+    :param scope: a filter on the table which limits rows to delete,
+        e.g. `Model.tenant_id == 1`. All rows of table are in scope by default.
+
+    :param returning: a sequence of elements representing table / Mapper / Declarative columns.
+        These columns will be returned for rows affected by each action.
+
+    :return: a dict of {action: result}, with "inserted", "updated" and "deleted" actions.
+        Result is a list of RowProxy if returning is requested, or an amount of affected rows otherwise.
+    """
+
+    table = utils.get_table(table_or_model)
+
+    values_series_cleaned = utils.clean_values(table, values_series)
+    columns = sorted(values_series_cleaned[0].keys()) if values_series_cleaned else []
+
+    reference_fields = sorted(
+        frozenset(utils.get_column_key(table, f) for f in reference)
+    )
+
+    if values_series_cleaned and set(reference_fields) - set(columns):
+        raise ValueError(
+            "reference field {rf} does not exist in table {tbl}".format(
+                rf=reference_fields, tbl=table.name
+            )
+        )
+
+    with stg.staged(
+        session, table, columns or reference_fields, values_series_cleaned
+    ) as staging:
+        return sync_staging(
+            session,
+            table,
+            staging,
+            columns,
+            reference_fields,
+            delete_missing=delete_missing,
+            scope=scope,
+            returning=returning,
+        )
+
+
+def sync_staging(
+    session: SessionType,
+    table: sa.Table,
+    staging: sa.Table,
+    columns: Sequence[Text],
+    reference_fields: Sequence[Text],
+    delete_missing: bool = True,
+    scope: Optional[ScopeType] = None,
+    returning: Optional[ReturningType] = None,
+) -> SyncResultType:
+    """
+    Makes the table match rows of a staging table.
+
+    :param session: session from SqlAlchemy
+    :param table: target table
+    :param staging: staging table, with columns of the target table
+    :param columns: keys of staged columns
+    :param reference_fields: keys of columns to identify rows
+    :param delete_missing: delete rows which are absent in the staging table
+    :param scope: a filter on the table which limits rows to delete
+    :param returning: columns to return for rows affected by each action
+    :return: a dict of {action: result}
+    """
+
+    result: SyncResultType = {
+        action: [] if returning else 0
+        for action in (consts.SYNC_INSERTED, consts.SYNC_UPDATED, consts.SYNC_DELETED)
+    }
+
+    columns_to_update = [column for column in columns if column not in reference_fields]
+
+    returning_columns = [
+        table.columns[utils.get_column_key(table, column)]
+        for column in (returning or [])
+    ]
+
+    column_types = utils.get_column_types(session, table)
+
+    def match(dst, src):
+        return sa.and_(
+            *(dst.columns[column] == src.columns[column] for column in reference_fields)
+        )
+
+    def differ(column):
+        dst_column = table.columns[column]
+        src_column = staging.columns[column]
+
+        if not utils.is_db_type_comparable(column_types[column].rstrip("[]")):
+            dst_column = sa.cast(dst_column, sa.Text)
+            src_column = sa.cast(src_column, sa.Text)
+
+        return dst_column.is_distinct_from(src_column)
+
+    queries = {}
+
+    if columns_to_update:
+        queries[consts.SYNC_UPDATED] = (
+            sa.update(table)
+            .values({column: staging.columns[column] for column in columns_to_update})
+            .where(match(table, staging))
+            .where(sa.or_(*(differ(column) for column in columns_to_update)))
+        )
+
+    if columns:
+        queries[consts.SYNC_INSERTED] = sa.insert(table).from_select(
+            columns,
+            sa.select([staging.columns[column] for column in columns]).where(
+                ~sa.exists().where(match(table, staging))
+            ),
+        )
+
+    if delete_missing:
+        query = sa.delete(table).where(~sa.exists().where(match(table, staging)))
+        if scope is not None:
+            query = query.where(scope)
+
+        queries[consts.SYNC_DELETED] = query
+
+    for action, query in queries.items():
+        if returning_columns:
+            query = query.returning(*returning_columns)
+
+        response = session.execute(query)
+
+        if returning_columns:
+            result[action] = response.fetchall()
+        else:
+            result[action] = response.rowcount
+
+    return result
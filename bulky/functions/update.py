@@ -1,11 +1,16 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Text, Tuple, Union
 
-from jinja2 import Template
+from sqlalchemy.orm.attributes import set_committed_value
 
 from bulky import consts
+from bulky.internals import execution
 from bulky.internals import sql
 from bulky.internals import utils
+from bulky.stats import Stats
 from bulky.types import (
+    CleanedValuesSeriesType,
+    ExpressionsType,
+    InstancesSeriesType,
     ReferenceType,
     ReturningType,
     RowsType,
@@ -14,23 +19,51 @@ from bulky.types import (
     ValuesSeriesType,
 )
 
-_template = Template(sql.STMT_UPDATE)
-
 
 def update(
     session: SessionType,
     table_or_model: TableType,
-    values_series: ValuesSeriesType,
+    values_series: Union[ValuesSeriesType, InstancesSeriesType],
     returning: Optional[ReturningType] = None,
     reference: ReferenceType = ("id",),
+    ordered: bool = False,
+    retries: int = 0,
+    stats: Optional[Stats] = None,
+    expressions: Optional[ExpressionsType] = None,
+    pipeline: bool = False,
+    prefetch: int = 0,
+    lock: Optional[Text] = None,
 ) -> RowsType:
     """
     Performs a bulk update query issued bypassing session cache
     :param session: SQLAlchemy session
     :param table_or_model: a table to insert data
-    :param values_series: list of labelled values (list of dicts)
+    :param values_series: list of labelled values (list of dicts),
+        or list of mapped instances: their loaded column attributes are written
+        and marked as committed
     :param returning: specifies which fields to return right after inserting
     :param reference: fields to identify rows
+    :param ordered: sort values by reference before chunking,
+        so concurrent updates lock overlapping rows in the same order
+    :param retries: how many times a chunk is retried on deadlock or serialization failure.
+        If set, each chunk runs under a savepoint.
+    :param stats: counters to fill, including retry counts
+    :param expressions: SQL expressions to update columns with, in {column: expression} format.
+        `{dst}` in expression stands for the current value, `{src}` - for the given one,
+        e.g. "{dst} + {src}". See bulky.expressions for common ones.
+    :param pipeline: send chunks in pipeline mode, if the connection is made by psycopg 3.
+        Several chunks are in flight at once, in the same transaction.
+        Can not be combined with retries. Other connections execute chunks sequentially.
+    :param prefetch: amount of chunks to clean and render on a worker thread
+        while the current chunk is executed. Disabled if 0.
+    :param lock: lock rows of each chunk before updating them, "skip_locked" or "nowait".
+        With "skip_locked", rows locked by other transactions are skipped,
+        only the acquired rows are updated, and the skipped values are collected
+        into `stats.skipped` to be retried later, as instances if instances are given.
+        Reference is expected to be unique.
+        With "nowait", a chunk fails if any of its rows is locked;
+        it is retried after a backoff if retries are allowed.
+        Rows stay locked until the end of transaction.
     :return: list of returning values or None
     """
 
@@ -39,12 +72,70 @@ def update(
 
     table = utils.get_table(table_or_model)
 
+    if utils.is_instances_series(values_series):
+        states = [
+            utils.get_instance_state(table, instance, values_index)
+            for values_index, instance in enumerate(values_series)
+        ]
+        values_series = [utils.get_instance_values(state) for state in states]
+
+        result: List = []
+
+        if lock is not None and stats is None:
+            # skipped values are needed to keep their instances modified
+            stats = Stats()
+
+        for states_group, values_group in utils.group_by_columns(states, values_series):
+            skipped_offset = len(stats.skipped) if stats is not None else 0
+
+            result.extend(
+                update(
+                    session,
+                    table,
+                    values_group,
+                    returning=returning,
+                    reference=reference,
+                    ordered=ordered,
+                    retries=retries,
+                    stats=stats,
+                    expressions=expressions,
+                    pipeline=pipeline,
+                    prefetch=prefetch,
+                    lock=lock,
+                )
+            )
+
+            skipped_states = set()
+
+            if stats is not None and lock is not None:
+                state_by_values = {
+                    id(values): state
+                    for state, values in zip(states_group, values_group)
+                }
+
+                # report skipped instances rather than their values
+                for i in range(skipped_offset, len(stats.skipped)):
+                    state = state_by_values[id(stats.skipped[i])]
+                    stats.skipped[i] = state.obj()
+                    skipped_states.add(state)
+
+            for state in states_group:
+                if state in skipped_states:
+                    continue
+
+                for prop in state.mapper.column_attrs:
+                    if prop.key in state.dict:
+                        set_committed_value(state.obj(), prop.key, state.dict[prop.key])
+
+        return result
+
     column_types = utils.get_column_types(session, table)
-    values_series = utils.clean_values(
-        table, values_series, cast_db_types=True, column_types=column_types
-    )
 
-    columns = frozenset(values_series[0].keys())
+    columns = frozenset(
+        utils.clean_values(
+            table, values_series[:1], cast_db_types=True, column_types=column_types
+        )[0].keys()
+    )
 
     reference_fields = frozenset(utils.get_column_key(table, f) for f in reference)
 
@@ -68,17 +159,81 @@ def update(
         utils.get_column_key(table, column) for column in (returning or [])
     )
 
-    chunked_values = (
-        values_series[i : i + consts.BULK_CHUNK_SIZE]
-        for i in range(0, len(values_series), consts.BULK_CHUNK_SIZE)
-    )
+    expressions_rendered = {}
 
-    conn = session.connection().execution_options(no_parameters=True)
+    for column, expression in (expressions or {}).items():
+        column = utils.get_column_key(table, column)
+
+        if column not in columns_to_update:
+            raise ValueError(
+                "expression field {ef} is not updated in table {tbl}".format(
+                    ef=column, tbl=table.name
+                )
+            )
+
+        expressions_rendered[column] = utils.render_expression(
+            expression,
+            dst=f'"{table.name}"."{column}"',
+            src=f'"src"."{column}"::{column_types[column]}',
+        )
+
+    if lock is not None:
+        if lock not in consts.LOCK_CLAUSES:
+            raise ValueError(
+                f"unknown lock {lock!r}, expect one of {sorted(consts.LOCK_CLAUSES)}"
+            )
+
+        if pipeline:
+            raise ValueError("lock is not supported in pipeline mode")
 
-    result: List = []
+    # chunks of cleaned values, along with indexes of values in values_series
+    chunked_values: Iterable[Tuple[Sequence[int], CleanedValuesSeriesType]]
 
-    for chunk in chunked_values:
-        stmt = _template.render(
+    if prefetch and not ordered:
+        # chunks are cleaned on the worker thread, along with rendering
+        chunked_values = (
+            (
+                range(i, min(i + consts.BULK_CHUNK_SIZE, len(values_series))),
+                utils.clean_values(
+                    table,
+                    values_series[i : i + consts.BULK_CHUNK_SIZE],
+                    cast_db_types=True,
+                    column_types=column_types,
+                    columns_common=columns,
+                    values_index_offset=i,
+                ),
+            )
+            for i in range(0, len(values_series), consts.BULK_CHUNK_SIZE)
+        )
+    else:
+        values_series_cleaned = utils.clean_values(
+            table, values_series, cast_db_types=True, column_types=column_types
+        )
+
+        indexes: Sequence[int] = range(len(values_series_cleaned))
+
+        if ordered:
+            indexes = sorted(
+                indexes,
+                key=lambda index: tuple(
+                    utils.get_literal_sort_key(values_series_cleaned[index][column])
+                    for column in reference_fields_sorted
+                ),
+            )
+
+        chunked_values = (
+            (
+                indexes[i : i + consts.BULK_CHUNK_SIZE],
+                [
+                    values_series_cleaned[index]
+                    for index in indexes[i : i + consts.BULK_CHUNK_SIZE]
+                ],
+            )
+            for i in range(0, len(indexes), consts.BULK_CHUNK_SIZE)
+        )
+
+    def render(template: Text, chunk: CleanedValuesSeriesType) -> Text:
+        stmt: Text = utils.get_template(template).render(
             src="src",
             dst=table.name,
             columns=columns_sorted,
@@ -88,9 +243,54 @@ def update(
             update_changed=update_changed,
             reference_fields=reference_fields_sorted,
             returning=returning,
+            expressions=expressions_rendered,
+            lock_clause=consts.LOCK_CLAUSES.get(lock or ""),
+        )
+
+        return stmt
+
+    conn = session.connection().execution_options(no_parameters=True)
+
+    result = []
+
+    if lock is None:
+        statements = (
+            render(sql.STMT_UPDATE, chunk) for _indexes, chunk in chunked_values
         )
 
-        response = conn.execute(stmt)
+        for rows in execution.execute_chunks(
+            conn,
+            execution.prefetch(statements, prefetch),
+            bool(returning),
+            retries,
+            stats,
+            pipeline,
+        ):
+            result.extend(rows)
+
+        return result
+
+    locking = (
+        (indexes, chunk, render(sql.STMT_LOCK, chunk))
+        for indexes, chunk in chunked_values
+    )
+
+    for indexes, chunk, stmt in execution.prefetch(locking, prefetch):
+        rows = execution.execute_chunk(conn, stmt, retries, stats).fetchall()
+
+        # values are skipped if any of their rows is locked by another transaction
+        skipped = {row.ordinal for row in rows if not row.acquired}
+        acquired = {row.ordinal for row in rows} - skipped
+
+        if stats is not None:
+            stats.skipped.extend(values_series[indexes[i]] for i in sorted(skipped))
+
+        chunk = [values for i, values in enumerate(chunk) if i in acquired]
+        if not chunk:
+            continue
+
+        # rows are locked already, so the statement does not wait for other transactions
+        response = conn.execute(render(sql.STMT_UPDATE, chunk))
 
         if returning:
             result.extend(response.fetchall())
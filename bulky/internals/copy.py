@@ -0,0 +1,192 @@
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Text, Tuple
+
+from psycopg2 import extensions
+
+from bulky import consts
+from bulky.internals import pipeline
+
+WriteType = Callable[[bytes], Any]
+
+_ESCAPES = {
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+
+_ESCAPE_RE = re.compile(r"\\(.)")
+
+
+def is_psycopg3(dbapi_connection) -> bool:
+    return pipeline.is_supported(dbapi_connection)
+
+
+def get_encoding(dbapi_connection) -> Text:
+    """
+    Returns Python name of the client encoding of DBAPI connection.
+
+    :param dbapi_connection: psycopg2 or psycopg 3 connection
+    :return: encoding name
+    """
+
+    if is_psycopg3(dbapi_connection):
+        encoding: Text = dbapi_connection.info.encoding
+        return encoding
+
+    encoding = extensions.encodings[dbapi_connection.encoding]
+    return encoding
+
+
+def mogrify(dbapi_connection, stmt: Text, params: Optional[Dict]) -> Text:
+    """
+    Renders params into a statement on the client side.
+
+    COPY does not accept params, so a query to copy is rendered in advance.
+
+    :param dbapi_connection: psycopg2 or psycopg 3 connection
+    :param stmt: statement with params placeholders
+    :param params: params of statement
+    :return: statement with params rendered as literals
+    """
+
+    if is_psycopg3(dbapi_connection):
+        cursor = sys.modules["psycopg"].ClientCursor(dbapi_connection)
+    else:
+        cursor = dbapi_connection.cursor()
+
+    with cursor:
+        rendered = cursor.mogrify(stmt, params or {})
+
+    if isinstance(rendered, bytes):
+        return rendered.decode(get_encoding(dbapi_connection))
+
+    result: Text = rendered
+
+    return result
+
+
+def copy_to(dbapi_connection, stmt: Text, write: WriteType) -> int:
+    """
+    Executes COPY ... TO STDOUT, passing data to `write` as it arrives.
+
+    Data are never accumulated, so memory use does not depend on amount of rows.
+
+    :param dbapi_connection: psycopg2 or psycopg 3 connection
+    :param stmt: COPY statement
+    :param write: a callable which receives chunks of data as bytes
+    :return: amount of copied rows
+    """
+
+    with dbapi_connection.cursor() as cursor:
+        if is_psycopg3(dbapi_connection):
+            with cursor.copy(stmt) as copy:
+                for data in copy:
+                    write(bytes(data))
+        else:
+            cursor.copy_expert(stmt, _Writer(write), size=consts.COPY_BUFFER_SIZE)
+
+        rowcount: int = cursor.rowcount
+
+    return rowcount
+
+
+def copy_from(dbapi_connection, stmt: Text, chunks: Iterable[bytes]) -> int:
+    """
+    Executes COPY ... FROM STDIN, sending chunks of data as they are produced.
+
+    :param dbapi_connection: psycopg2 or psycopg 3 connection
+    :param stmt: COPY statement
+    :param chunks: chunks of data in the format of COPY statement
+    :return: amount of copied rows
+    """
+
+    with dbapi_connection.cursor() as cursor:
+        if is_psycopg3(dbapi_connection):
+            with cursor.copy(stmt) as copy:
+                for chunk in chunks:
+                    copy.write(chunk)
+        else:
+            cursor.copy_expert(stmt, _Reader(chunks), size=consts.COPY_BUFFER_SIZE)
+
+        rowcount: int = cursor.rowcount
+
+    return rowcount
+
+
+class _Writer:
+    def __init__(self, write: WriteType):
+        self.write = write
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+
+    def read(self, _size: int = -1) -> bytes:
+        # an empty chunk means the end of data for psycopg2
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+
+        return b""
+
+
+class TextRowsReader:
+    """
+    Parses data in COPY text format into batches of rows.
+
+    Each row is a tuple of strings, NULL is represented by None.
+    """
+
+    def __init__(self, encoding: Text, batch_size: int, emit: Callable[[List], Any]):
+        self._encoding = encoding
+        self._batch_size = batch_size
+        self._emit = emit
+        self._tail = b""
+        self._batch: List[Tuple] = []
+
+    def write(self, data: bytes) -> None:
+        lines = (self._tail + data).split(b"\n")
+        self._tail = lines.pop()
+
+        for line in lines:
+            self._batch.append(parse_text_row(line.decode(self._encoding)))
+
+            if len(self._batch) >= self._batch_size:
+                self._emit(self._batch)
+                self._batch = []
+
+    def close(self) -> None:
+        if self._tail:
+            self.write(b"\n")
+
+        if self._batch:
+            self._emit(self._batch)
+            self._batch = []
+
+
+def parse_text_row(line: Text) -> Tuple:
+    """
+    Parses a line of COPY text format into a tuple of values.
+
+    :param line: a line without trailing newline
+    :return: tuple of strings or None for NULL
+    """
+
+    return tuple(
+        (
+            None
+            if field == "\\N"
+            else (_ESCAPE_RE.sub(_unescape, field) if "\\" in field else field)
+        )
+        for field in line.split("\t")
+    )
+
+
+def _unescape(match) -> Text:
+    char: Text = match.group(1)
+    return _ESCAPES.get(char, char)
@@ -0,0 +1,209 @@
+import json
+import math
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Text, Union
+from uuid import UUID
+
+from psycopg2.extensions import adapt
+
+LiteralType = Union[Text, int, float]
+EncoderType = Callable[[Any], LiteralType]
+
+_registry: Dict[Text, EncoderType] = {}
+
+
+def register_encoder(db_type: Text, encoder: EncoderType) -> None:
+    """
+    Registers an encoder of values for columns of given database type.
+
+    Encoder takes a value which is not None and returns an SQL literal.
+    A literal is cast to the column type in a statement.
+
+    :param db_type: database name of column type, as in information_schema,
+        or a type name for user-defined types
+    :param encoder: a callable which encodes a value into SQL literal
+    """
+
+    _registry[db_type] = encoder
+
+
+def get_encoder(db_type: Optional[Text]) -> EncoderType:
+    """
+    Returns an encoder of values for columns of given database type.
+
+    Types without a registered encoder are encoded by to_db_literal.
+
+    :param db_type: database name of column type
+    :return: encoder
+    """
+
+    encoder = _registry.get(db_type or "")
+    if encoder is None:
+        encoder = partial(to_db_literal, cast_to=db_type)
+
+    return encoder
+
+
+def quote_literal(value: Text) -> Text:
+    """
+    Quotes a string as SQL literal.
+
+    The result does not depend on standard_conforming_strings setting:
+    strings with backslashes are quoted as escape strings.
+
+    :param value: string to quote
+    :return: SQL literal
+    """
+
+    value = value.replace("'", "''")
+
+    if "\\" in value:
+        return "E'" + value.replace("\\", "\\\\") + "'"
+
+    return "'" + value + "'"
+
+
+def to_db_literal(value, cast_to=None) -> LiteralType:
+    if value is None:
+        return "null"
+    elif isinstance(value, str):
+        return quote_literal(value)
+    elif isinstance(value, bool):
+        return int(value)
+    elif isinstance(value, int):
+        return int(value)
+    elif isinstance(value, float):
+        return encode_float(value)
+    elif isinstance(value, (dict, list)):
+        if cast_to == "json" or cast_to == "jsonb":
+            return encode_json(value)
+        elif cast_to == "hstore":
+            return encode_hstore(value)
+        else:
+            literal: Text = adapt(value).getquoted().decode("utf-8")
+            return literal
+    elif isinstance(value, Decimal):
+        return str(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        return encode_bytea(value)
+    elif isinstance(value, (datetime, date, time)):
+        return quote_literal(value.isoformat())
+    elif isinstance(value, Enum):
+        return quote_literal(value.name)
+    else:
+        return quote_literal(str(value))
+
+
+def encode_text(value) -> LiteralType:
+    if type(value) is str:
+        return quote_literal(value)
+
+    return to_db_literal(value)
+
+
+def encode_integer(value) -> LiteralType:
+    if type(value) is int:
+        return value
+
+    return to_db_literal(value)
+
+
+def encode_float(value) -> LiteralType:
+    if type(value) is not float:
+        return to_db_literal(value)
+
+    if math.isfinite(value):
+        return value
+
+    if math.isnan(value):
+        return "'NaN'"
+
+    return "'Infinity'" if value > 0 else "'-Infinity'"
+
+
+def encode_numeric(value) -> LiteralType:
+    if type(value) is Decimal:
+        return str(value)
+
+    if type(value) is float:
+        return encode_float(value)
+
+    return to_db_literal(value)
+
+
+def encode_boolean(value) -> LiteralType:
+    if type(value) is bool:
+        return "true" if value else "false"
+
+    return to_db_literal(value)
+
+
+def encode_temporal(value) -> LiteralType:
+    if isinstance(value, (datetime, date, time)):
+        return "'" + value.isoformat() + "'"
+
+    return to_db_literal(value)
+
+
+def encode_uuid(value) -> LiteralType:
+    if type(value) is UUID:
+        return "'" + str(value) + "'"
+
+    return to_db_literal(value)
+
+
+def encode_bytea(value) -> LiteralType:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "E'\\\\x" + value.hex() + "'"
+
+    return to_db_literal(value)
+
+
+def encode_json(value) -> LiteralType:
+    if isinstance(value, str):
+        return quote_literal(value)
+
+    return quote_literal(json.dumps(value))
+
+
+def encode_hstore(value) -> LiteralType:
+    if not isinstance(value, dict):
+        return to_db_literal(value)
+
+    def escape(item):
+        return '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    s = ",".join(
+        "{}=>{}".format(escape(k), "NULL" if v is None else escape(v))
+        for k, v in value.items()
+    )
+
+    return quote_literal(s)
+
+
+for _db_type, _encoder in (
+    ("bigint", encode_integer),
+    ("boolean", encode_boolean),
+    ("bytea", encode_bytea),
+    ("character varying", encode_text),
+    ("character", encode_text),
+    ("date", encode_temporal),
+    ("double precision", encode_float),
+    ("hstore", encode_hstore),
+    ("integer", encode_integer),
+    ("json", encode_json),
+    ("jsonb", encode_json),
+    ("numeric", encode_numeric),
+    ("real", encode_float),
+    ("smallint", encode_integer),
+    ("text", encode_text),
+    ("time with time zone", encode_temporal),
+    ("time without time zone", encode_temporal),
+    ("timestamp with time zone", encode_temporal),
+    ("timestamp without time zone", encode_temporal),
+    ("uuid", encode_uuid),
+):
+    register_encoder(_db_type, _encoder)
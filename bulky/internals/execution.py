@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from queue import Full, Queue
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy.exc import DBAPIError
+
+from bulky import consts
+from bulky.internals import pipeline as pipelining
+from bulky.internals import sql
+from bulky.stats import Stats
+
+
+def execute_chunks(
+    conn,
+    statements: Iterable,
+    fetch: bool,
+    retries: int = 0,
+    stats: Optional[Stats] = None,
+    pipeline: bool = False,
+) -> Iterator[List]:
+    """
+    Executes statements of chunks one by one, or in pipeline mode.
+
+    Pipeline mode is used if requested and supported by DBAPI connection,
+    otherwise statements are executed sequentially.
+
+    :param conn: SqlAlchemy connection
+    :param statements: statements to execute, one per chunk
+    :param fetch: fetch rows returned by statements
+    :param retries: how many times a failed chunk may be retried
+    :param stats: counters to fill
+    :param pipeline: execute in pipeline mode
+    :return: an iterator of rows per chunk, in the order of statements
+    """
+
+    dbapi_connection = conn.connection.connection
+
+    if pipeline and pipelining.is_supported(dbapi_connection):
+        if retries:
+            raise ValueError("retries are not supported in pipeline mode")
+
+        compiled = (compile_statement(conn, stmt) for stmt in statements)
+
+        for rows in pipelining.execute_pipelined(dbapi_connection, compiled, fetch):
+            if stats is not None:
+                stats.chunks += 1
+
+            yield rows
+
+        return
+
+    for stmt in statements:
+        response = execute_chunk(conn, stmt, retries, stats)
+
+        yield response.fetchall() if fetch else []
+
+
+def compile_statement(conn, stmt) -> pipelining.StatementType:
+    """
+    Compiles a statement into SQL and params for DBAPI cursor.
+
+    :param conn: SqlAlchemy connection
+    :param stmt: SQL string or SqlAlchemy statement
+    :return: (SQL, params) pair, params are None for SQL strings
+    """
+
+    if isinstance(stmt, str):
+        return stmt, None
+
+    compiled = stmt.compile(dialect=conn.dialect)
+
+    return str(compiled), compiled.params
+
+
+def execute_chunk(conn, stmt, retries: int = 0, stats: Optional[Stats] = None):
+    """
+    Executes a statement of a single chunk.
+
+    If retries are allowed, the statement runs under a savepoint.
+    On deadlock, serialization failure or unavailable lock the savepoint is rolled back
+    and the statement is executed again after an exponential backoff.
+
+    :param conn: SqlAlchemy connection
+    :param stmt: statement to execute
+    :param retries: how many times a failed chunk may be retried
+    :param stats: counters to fill
+    :return: statement response
+    """
+
+    if stats is not None:
+        stats.chunks += 1
+
+    if not retries:
+        return conn.execute(stmt)
+
+    attempt = 0
+
+    while True:
+        conn.execute(sql.STMT_SAVEPOINT)
+
+        try:
+            response = conn.execute(stmt)
+        except DBAPIError as err:
+            conn.execute(sql.STMT_ROLLBACK_TO_SAVEPOINT)
+            conn.execute(sql.STMT_RELEASE_SAVEPOINT)
+
+            pgcode = getattr(err.orig, "pgcode", None)
+            if pgcode not in consts.RETRYABLE_PGCODES or attempt >= retries:
+                raise
+
+            if stats is not None:
+                stats.retries += 1
+                if pgcode == consts.PGCODE_DEADLOCK_DETECTED:
+                    stats.deadlocks += 1
+                elif pgcode == consts.PGCODE_LOCK_NOT_AVAILABLE:
+                    stats.lock_failures += 1
+                else:
+                    stats.serialization_failures += 1
+
+            time.sleep(get_backoff(attempt))
+            attempt += 1
+            continue
+
+        conn.execute(sql.STMT_RELEASE_SAVEPOINT)
+
+        return response
+
+
+def get_backoff(attempt: int) -> float:
+    """
+    Returns a delay before the next attempt, in seconds.
+
+    Delay grows exponentially and is jittered,
+    so the conflicting workers do not retry in lockstep.
+
+    :param attempt: number of the failed attempt, starting from 0
+    :return: delay in seconds
+    """
+
+    delay = min(consts.RETRY_BACKOFF * 2.0**attempt, consts.RETRY_BACKOFF_MAX)
+    delay *= random.uniform(0.5, 1.5)
+
+    return delay
+
+
+_PREFETCH_DONE = object()
+_PREFETCH_FAILED = object()
+
+
+def prefetch(items: Iterable, depth: int) -> Iterator:
+    """
+    Produces items on a worker thread, ahead of the consumer.
+
+    At most `depth` produced items wait for the consumer.
+    Items keep their order. An error raised by the producer
+    is re-raised to the consumer after all items produced before it.
+    If the consumer stops early, the producer is stopped as well.
+
+    :param items: an iterable to produce items from
+    :param depth: amount of items to produce ahead. Items are produced inline if 0.
+    :return: an iterator of items
+    """
+
+    if depth < 1:
+        yield from items
+        return
+
+    queue: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(entry, timeout=consts.PREFETCH_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((None, item)):
+                    return
+        except BaseException as err:
+            put((_PREFETCH_FAILED, err))
+        else:
+            put((_PREFETCH_DONE, None))
+
+    worker = threading.Thread(target=produce, name="bulky-prefetch", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            marker, payload = queue.get()
+
+            if marker is _PREFETCH_DONE:
+                return
+
+            if marker is _PREFETCH_FAILED:
+                raise payload
+
+            yield payload
+    finally:
+        stopped.set()
+        worker.join()
@@ -0,0 +1,76 @@
+import sys
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from bulky import consts
+from bulky import errors
+
+StatementType = Tuple[Any, Optional[Any]]
+
+
+def is_supported(dbapi_connection) -> bool:
+    """
+    Checks if DBAPI connection is able to execute statements in pipeline mode.
+
+    Pipeline mode is provided by psycopg 3 only.
+    psycopg is not imported here: a psycopg 3 connection exists only if it is imported already.
+
+    :param dbapi_connection: DBAPI connection
+    :return: pipeline mode is supported
+    """
+
+    psycopg = sys.modules.get("psycopg")
+
+    return psycopg is not None and isinstance(dbapi_connection, psycopg.Connection)
+
+
+def execute_pipelined(
+    dbapi_connection,
+    statements: Iterable[StatementType],
+    fetch: bool,
+    depth: int = consts.PIPELINE_DEPTH,
+) -> Iterator[List]:
+    """
+    Executes statements in pipeline mode of psycopg 3.
+
+    Up to `depth` statements are sent without waiting for results,
+    then pipeline is synced and results are collected in order.
+    Statements run in the current transaction of connection.
+
+    :param dbapi_connection: psycopg 3 connection
+    :param statements: (statement, params) pairs, one per chunk
+    :param fetch: fetch rows returned by statements
+    :param depth: maximum amount of statements in flight
+    :return: an iterator of rows per chunk, in the order of statements
+    """
+
+    import psycopg
+
+    pending: List[Tuple[int, Any]] = []
+
+    try:
+        with dbapi_connection.pipeline() as pipeline:
+            for index, (stmt, params) in enumerate(statements):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(stmt, params)
+                pending.append((index, cursor))
+
+                if len(pending) >= depth:
+                    yield from _collect(pipeline, pending, fetch)
+
+            yield from _collect(pipeline, pending, fetch)
+    except psycopg.Error as err:
+        failed = next(
+            (index for index, cursor in pending if cursor.pgresult is None), None
+        )
+        raise errors.ChunkExecutionError(failed, str(err)) from err
+
+
+def _collect(pipeline, pending: List[Tuple[int, Any]], fetch: bool) -> Iterator[List]:
+    pipeline.sync()
+
+    while pending:
+        _index, cursor = pending[0]
+        rows = cursor.fetchall() if fetch else []
+        pending.pop(0)
+
+        yield rows
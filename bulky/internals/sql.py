@@ -18,7 +18,11 @@ WITH {{src}} (
 UPDATE "{{dst}}"
 SET
     {%- for column in columns_to_update %}
+    {%- if column in expressions %}
+    "{{column}}" = {{expressions[column]}}
+    {%- else %}
     "{{column}}" = "{{src}}"."{{column}}"::{{column_types[column]}}
+    {%- endif %}
     {%- if not loop.last %}, {% endif -%}
     {% endfor %}
 FROM
@@ -32,10 +36,14 @@ WHERE
     AND (
     {% for column in columns_to_update %}
         {%- if not loop.first %}OR {% endif -%}
+        {%- if column in expressions -%}
+        "{{dst}}"."{{column}}" IS DISTINCT FROM ({{expressions[column]}})
+        {% else -%}
         "{{dst}}"."{{column}}"
                 <> "{{src}}"."{{column}}"::{{column_types[column]}}
         OR "{{dst}}"."{{column}}" IS NULL
         OR "{{src}}"."{{column}}" IS NULL
+        {% endif -%}
     {% endfor -%}
     )
 {%- endif -%}
@@ -48,6 +56,42 @@ RETURNING
 ;
 """
 
+STMT_LOCK = """
+WITH {{src}} (
+    "bulky_ordinal",
+    {% for column in reference_fields -%}
+    "{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor %}
+) AS (
+    VALUES
+    {%- for values in values_list %}
+    ({{loop.index0}}, {% for column in reference_fields -%}
+        {{values[column]}}
+        {%- if not loop.last %}, {% endif -%}
+        {%- endfor -%}
+    )
+    {%- if not loop.last %}, {% endif -%}
+    {% endfor %}
+)
+SELECT
+    "{{src}}"."bulky_ordinal" AS ordinal,
+    "bulky_locked"."acquired" IS NOT NULL AS acquired
+FROM
+    "{{src}}"
+    JOIN "{{dst}}" ON
+    {%- for column in reference_fields %}
+    "{{dst}}"."{{column}}" = "{{src}}"."{{column}}"::{{column_types[column]}}
+    {%- if not loop.last %} AND {% endif -%}
+    {% endfor %}
+    LEFT JOIN LATERAL (
+        SELECT true AS acquired
+        FROM "{{dst}}" AS "bulky_row"
+        WHERE "bulky_row".ctid = "{{dst}}".ctid
+        FOR UPDATE {{lock_clause}}
+    ) AS "bulky_locked" ON true
+;
+"""
+
 STMT_GET_COLUMN_TYPES = """
 SELECT
     c.column_name,
@@ -81,3 +125,167 @@ SELECT
     ORDER BY c.ordinal_position
     ;
 """
+
+STMT_SAVEPOINT = "SAVEPOINT bulky_chunk;"
+
+STMT_RELEASE_SAVEPOINT = "RELEASE SAVEPOINT bulky_chunk;"
+
+STMT_ROLLBACK_TO_SAVEPOINT = "ROLLBACK TO SAVEPOINT bulky_chunk;"
+
+STMT_CREATE_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS "{{table_name}}" (
+    "key" text PRIMARY KEY,
+    "offset" bigint NOT NULL
+);
+"""
+
+STMT_LOAD_CHECKPOINT = """
+SELECT "offset" FROM "{{table_name}}" WHERE "key" = :key;
+"""
+
+STMT_SAVE_CHECKPOINT = """
+INSERT INTO "{{table_name}}" ("key", "offset")
+VALUES (:key, :offset)
+ON CONFLICT ("key") DO UPDATE SET "offset" = EXCLUDED."offset";
+"""
+
+STMT_CLEAR_CHECKPOINT = """
+DELETE FROM "{{table_name}}" WHERE "key" = :key;
+"""
+
+STMT_CREATE_STAGING = """
+CREATE TEMPORARY TABLE "{{staging}}" ON COMMIT DROP AS
+SELECT
+    {% for column in columns -%}
+    "{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor %}
+FROM "{{table_name}}"
+WITH NO DATA
+;
+"""
+
+STMT_ANALYZE = """
+ANALYZE "{{table_name}}";
+"""
+
+STMT_DROP_TABLE = """
+DROP TABLE "{{table_name}}";
+"""
+
+STMT_GET_SECONDARY_INDEXES = """
+SELECT
+    i.relname AS name,
+    pg_get_indexdef(i.oid) AS definition
+    FROM pg_index x
+        JOIN pg_class i
+            ON i.oid = x.indexrelid
+    WHERE x.indrelid = '"{{table_name}}"'::regclass
+        AND NOT EXISTS (
+            SELECT 1
+            FROM pg_constraint c
+            WHERE c.conrelid = x.indrelid
+                AND c.conindid = x.indexrelid
+                AND c.contype IN ('p', 'u', 'x')
+        )
+    ORDER BY i.relname
+    ;
+"""
+
+STMT_GET_DEFERRABLE_CONSTRAINTS = """
+SELECT
+    c.conname AS name,
+    pg_get_constraintdef(c.oid) AS definition
+    FROM pg_constraint c
+    WHERE c.conrelid = '"{{table_name}}"'::regclass
+        AND c.contype IN ('c', 'f')
+    ORDER BY c.conname
+    ;
+"""
+
+STMT_DROP_INDEX = """
+DROP INDEX "{{name}}";
+"""
+
+STMT_DROP_CONSTRAINT = """
+ALTER TABLE "{{table_name}}" DROP CONSTRAINT "{{name}}";
+"""
+
+STMT_ADD_CONSTRAINT = """
+ALTER TABLE "{{table_name}}" ADD CONSTRAINT "{{name}}" {{definition}}
+{%- if not_valid %} NOT VALID{% endif %};
+"""
+
+STMT_VALIDATE_CONSTRAINT = """
+ALTER TABLE "{{table_name}}" VALIDATE CONSTRAINT "{{name}}";
+"""
+
+STMT_SAVEPOINT_LOAD = "SAVEPOINT bulky_load;"
+
+STMT_RELEASE_SAVEPOINT_LOAD = "RELEASE SAVEPOINT bulky_load;"
+
+STMT_ROLLBACK_TO_SAVEPOINT_LOAD = "ROLLBACK TO SAVEPOINT bulky_load;"
+
+STMT_ALLOCATE_SEQUENCE_VALUES = """
+SELECT
+    nextval(pg_get_serial_sequence('"{{table_name}}"', '{{column}}')) AS value
+    FROM generate_series(1, {{amount}})
+    ;
+"""
+
+STMT_SELECT = """
+WITH {{src}} (
+    {% for column in reference_fields -%}
+    "{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor %}
+) AS (
+    VALUES
+    {%- for values in values_list %}
+    (
+        {%- for column in reference_fields -%}
+        {{values[column]}}
+        {%- if not loop.last %}, {% endif -%}
+        {%- endfor -%}
+    )
+    {%- if not loop.last %}, {% endif -%}
+    {% endfor %}
+)
+SELECT
+    {% for column in columns -%}
+    "{{dst}}"."{{column}}"{%- if not loop.last %},{% endif %}
+    {% endfor -%}
+FROM
+    "{{dst}}"
+WHERE (
+    {%- for column in reference_fields -%}
+    "{{dst}}"."{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor -%}
+) IN (
+    SELECT
+        {% for column in reference_fields -%}
+        "{{src}}"."{{column}}"::{{column_types[column]}}{% if not loop.last %}, {% endif -%}
+        {%- endfor %}
+    FROM "{{src}}"
+)
+;
+"""
+
+STMT_COPY_TO = """
+COPY
+{%- if query %} ({{query}})
+{%- else %} "{{table_name}}" (
+    {%- for column in columns -%}
+    "{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor -%}
+)
+{%- endif %}
+TO STDOUT WITH (FORMAT {{format}}{% if header %}, HEADER true{% endif %});
+"""
+
+STMT_COPY_FROM = """
+COPY "{{table_name}}" (
+    {%- for column in columns -%}
+    "{{column}}"{% if not loop.last %}, {% endif -%}
+    {%- endfor -%}
+)
+FROM STDIN WITH (FORMAT csv, DELIMITER '{{delimiter}}', ENCODING '{{encoding}}');
+"""
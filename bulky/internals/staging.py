@@ -0,0 +1,97 @@
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Sequence, Text
+
+import sqlalchemy as sa
+from sqlalchemy import Table
+
+from bulky import consts
+from bulky.internals import sql
+from bulky.internals import utils
+from bulky.types import CleanedValuesSeriesType, SessionType
+
+
+@contextmanager
+def staged(
+    session: SessionType,
+    table: Table,
+    columns: Sequence[Text],
+    values_series: CleanedValuesSeriesType,
+) -> Iterator[Table]:
+    """
+    Stages values in a temporary table.
+
+    The staging table has given columns of the target table, with the same types
+    and without constraints. It is analyzed after filling and dropped on exit.
+
+    :param session: SqlAlchemy session
+    :param table: target table
+    :param columns: keys of columns to stage
+    :param values_series: cleaned values
+    :return: staging table
+    """
+
+    with staging_table(session, table, columns) as staging:
+        for i in range(0, len(values_series), consts.BULK_CHUNK_SIZE):
+            chunk = values_series[i : i + consts.BULK_CHUNK_SIZE]
+            session.execute(sa.insert(staging, values=chunk, inline=True))
+
+        analyze(session, staging)
+
+        yield staging
+
+
+@contextmanager
+def staging_table(
+    session: SessionType, table: Table, columns: Sequence[Text]
+) -> Iterator[Table]:
+    """
+    Creates an empty staging table, which is dropped on exit.
+
+    :param session: SqlAlchemy session
+    :param table: target table
+    :param columns: keys of columns to stage
+    :return: staging table
+    """
+
+    staging = create_staging_table(session, table, columns)
+
+    yield staging
+
+    session.execute(
+        sa.text(utils.get_template(sql.STMT_DROP_TABLE).render(table_name=staging.name))
+    )
+
+
+def analyze(session: SessionType, staging: Table) -> None:
+    session.execute(
+        sa.text(utils.get_template(sql.STMT_ANALYZE).render(table_name=staging.name))
+    )
+
+
+def create_staging_table(
+    session: SessionType, table: Table, columns: Sequence[Text]
+) -> Table:
+    """
+    Creates an empty temporary table with given columns of the target table.
+
+    :param session: SqlAlchemy session
+    :param table: target table
+    :param columns: keys of columns
+    :return: staging table
+    """
+
+    name = f"bulky_staging_{uuid.uuid4().hex}"
+
+    stmt = utils.get_template(sql.STMT_CREATE_STAGING).render(
+        staging=name, table_name=table.name, columns=columns
+    )
+    session.execute(sa.text(stmt))
+
+    staging = sa.Table(
+        name,
+        sa.MetaData(),
+        *(sa.Column(column, table.columns[column].type) for column in columns),
+    )
+
+    return staging
@@ -1,25 +1,26 @@
-import json
-from decimal import Decimal
-from typing import Dict, List, Optional, Text
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Text, Tuple
 
 import sqlalchemy as sa
 from jinja2 import Template
-from psycopg2.extensions import QuotedString, adapt
 from sqlalchemy import Table
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.orm import Mapper, Session
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.state import InstanceState
 from typeguard import check_type, typechecked
 
 from bulky import consts
 from bulky import errors
 from bulky.internals import sql
+from bulky.internals.encoders import EncoderType, get_encoder, to_db_literal
 from bulky.types import (
     CleanReturningType,
     CleanedValuesSeriesType,
     ColumnPropertyType,
     ColumnType,
     ColumnTypesMapType,
+    InstanceType,
     ReturningType,
     TableColumnsSetType,
     TableType,
@@ -105,6 +106,89 @@ def clean_returning(
     return cleaned
 
 
+def is_instances_series(values_series) -> bool:
+    """
+    Checks if values_series consists of mapped instances rather than of dicts.
+
+    :param values_series: sequence of dicts or of mapped instances
+    :return: True if the first element is a mapped instance
+    """
+
+    if not values_series:
+        return False
+
+    return isinstance(sa.inspect(values_series[0], raiseerr=False), InstanceState)
+
+
+def get_instance_state(
+    table_or_model: TableType, instance: InstanceType, values_index: int
+) -> InstanceState:
+    """
+    Returns a state of mapped instance, validating it belongs to the table.
+
+    :param table_or_model: SqlAlchemy table or mapper or model
+    :param instance: an instance of mapped class
+    :param values_index: index of instance in values_series
+    :return: instance state
+    """
+
+    state = sa.inspect(instance, raiseerr=False)
+
+    if not isinstance(state, InstanceState):
+        raise errors.InvalidValueError(values_index, "not a mapped instance")
+
+    if state.mapper.local_table is not get_table(table_or_model):
+        raise errors.InvalidValueError(
+            values_index, f"instance is not mapped to {get_table_name(table_or_model)}"
+        )
+
+    return state
+
+
+def get_instance_values(state: InstanceState) -> ValuesType:
+    """
+    Returns loaded column values of mapped instance.
+
+    Expired and never set attributes are omitted.
+
+    :param state: instance state
+    :return: values in {column key: value} format
+    """
+
+    values: ValuesType = {
+        prop.columns[0].key: state.dict[prop.key]
+        for prop in state.mapper.column_attrs
+        if prop.key in state.dict
+    }
+
+    return values
+
+
+def group_by_columns(
+    states: Sequence[InstanceState], values_series: ValuesSeriesType
+) -> List[Tuple[List[InstanceState], List[ValuesType]]]:
+    """
+    Groups instances by the set of columns in their values.
+
+    Values in each group have the same keys, so they can be written in bulk.
+
+    :param states: states of mapped instances
+    :param values_series: values of instances, in the same order
+    :return: list of (states, values) pairs
+    """
+
+    groups: Dict[FrozenSet[Text], Tuple[List[InstanceState], List[ValuesType]]] = {}
+
+    for state, values in zip(states, values_series):
+        states_group, values_group = groups.setdefault(
+            frozenset(values.keys()), ([], [])
+        )
+        states_group.append(state)
+        values_group.append(values)
+
+    return list(groups.values())
+
+
 def validate_values(values: ValuesType, values_index: int):
     try:
         check_type("values", values, ValuesType)
@@ -123,14 +207,20 @@ def clean_values(
     values_series: ValuesSeriesType,
     cast_db_types: bool = False,
     column_types: Optional[ColumnTypesMapType] = None,
+    columns_common: Optional[TableColumnsSetType] = None,
+    values_index_offset: int = 0,
 ) -> CleanedValuesSeriesType:
     """
     Cleans up and validates keys and values in values_series.
 
     :param table_or_model: SqlAlchemy table or mapper or model
     :param values_series: sequence of dicts with values
-    :param cast_db_types: determines if need to cast values to db types
+    :param cast_db_types: determines if need to cast values to db types,
+        with encoders picked once per column by its type
     :param column_types: column types map
+    :param columns_common: keys expected in each values, taken from the first values if empty.
+        Used to clean a long values_series chunk by chunk.
+    :param values_index_offset: index of the first values in the whole values_series
     :return: sequence of cleaned values ({column name: value} dicts)
     """
 
@@ -141,7 +231,6 @@ def clean_values(
 
     # common columns used in values_list
     # expected to be the same in each values set
-    columns_common = None
 
     columns_table = get_table_columns(table_or_model)
 
@@ -150,9 +239,12 @@ def clean_values(
 
     column_types = column_types or {}
 
+    # map: column name -> encoder of values, resolved once per column
+    encoders: Dict[Text, EncoderType] = {}
+
     # remap values: change dirty key to actual key for each values
 
-    for values_index, values in enumerate(values_series):
+    for values_index, values in enumerate(values_series, values_index_offset):
         validate_values(values, values_index)
 
         columns_current = set()
@@ -172,10 +264,16 @@ def clean_values(
 
             if not cast_db_types:
                 value_cleaned = value
+            elif value is None:
+                value_cleaned = "null"
             else:
-                value_cleaned = to_db_literal(
-                    value, cast_to=column_types.get(column_cleaned)
-                )
+                encoder = encoders.get(column_cleaned)
+                if encoder is None:
+                    encoder = encoders[column_cleaned] = get_encoder(
+                        column_types.get(column_cleaned)
+                    )
+
+                value_cleaned = encoder(value)
 
             values_cleaned[column_cleaned] = value_cleaned
 
@@ -201,6 +299,22 @@ def clean_values(
     return result
 
 
+@lru_cache(maxsize=None)
+def get_template(source: Text) -> Template:
+    """
+    Returns a compiled Jinja2 template of SQL statement.
+
+    Templates are compiled on first use rather than on import.
+
+    :param source: template source, one of STMT_* in bulky.internals.sql
+    :return: compiled template
+    """
+
+    template: Template = Template(source)
+
+    return template
+
+
 @typechecked(always=True)
 def get_column_types(session: Session, table_or_model: TableType) -> ColumnTypesMapType:
     """
@@ -216,7 +330,7 @@ def get_column_types(session: Session, table_or_model: TableType) -> ColumnTypes
     if table_name in _column_type_cache:
         return _column_type_cache[table_name]
 
-    stmt = Template(sql.STMT_GET_COLUMN_TYPES).render(table_name=table_name)
+    stmt = get_template(sql.STMT_GET_COLUMN_TYPES).render(table_name=table_name)
 
     response = session.execute(sa.text(stmt)).fetchall()
 
@@ -226,34 +340,67 @@ def get_column_types(session: Session, table_or_model: TableType) -> ColumnTypes
     return result
 
 
-def to_db_literal(value, cast_to=None):
-    if value is None:
-        return "null"
-    elif isinstance(value, str):
-        value = QuotedString(value.encode("utf-8")).getquoted().decode("utf-8")
-        return value
-    elif isinstance(value, bool):
-        value = int(value)
-        return value
-    elif isinstance(value, (int, float)):
-        return value
-    elif isinstance(value, (dict, list)):
-        if cast_to == "json" or cast_to == "jsonb":
-            value = json.dumps(value)
-            return QuotedString(value).getquoted().decode("utf-8")
-        elif cast_to == "hstore":
-            assert isinstance(value, dict)  # TODO: discover if `assert` is enough
-            s = ",".join(
-                '"{}"=>{}'.format(k, "NULL" if v is None else '"{}"'.format(v))
-                for k, v in value.items()
-            )
-            return QuotedString(s).getquoted().decode("utf-8")
-        else:
-            return adapt(value).getquoted().decode("utf-8")
-    elif isinstance(value, Decimal):
-        return str(value)
-    else:
-        return QuotedString(str(value)).getquoted().decode("utf-8")
+@typechecked(always=True)
+def allocate_sequence_values(
+    session: Session, table_or_model: TableType, column: Text, amount: int
+) -> List[int]:
+    """
+    Takes next values from a sequence which generates values of the column.
+
+    Values are allocated in one round trip,
+    so the keys of rows are known before the rows are inserted.
+
+    :param session: SqlAlchemy session
+    :param table_or_model: SqlAlchemy table or mapper or model
+    :param column: key of a serial or identity column
+    :param amount: amount of values to allocate
+    :return: allocated values
+    """
+
+    table_name = get_table_name(table_or_model)
+
+    stmt = get_template(sql.STMT_ALLOCATE_SEQUENCE_VALUES).render(
+        table_name=table_name, column=column, amount=amount
+    )
+
+    response = session.execute(sa.text(stmt)).fetchall()
+
+    result = [row.value for row in response]
+
+    if any(value is None for value in result):
+        raise errors.InvalidColumnError(
+            column, f"no sequence is attached in table {table_name}"
+        )
+
+    return result
+
+
+@typechecked(always=True)
+def render_expression(expression: Text, dst: Text, src: Text) -> Text:
+    """
+    Renders an update expression into SQL.
+
+    :param expression: expression with `{dst}` and `{src}` placeholders
+    :param dst: SQL reference to the current value of column
+    :param src: SQL reference to the given value of column
+    :return: SQL expression
+    """
+
+    return expression.replace("{dst}", dst).replace("{src}", src)
+
+
+def get_literal_sort_key(literal):
+    """
+    Returns a key to sort db literals in a stable total order.
+
+    Literals produced by to_db_literal are either numbers or strings,
+    which are not comparable between each other.
+
+    :param literal: a value produced by to_db_literal
+    :return: sort key
+    """
+
+    return isinstance(literal, str), literal
 
 
 @typechecked(always=True)
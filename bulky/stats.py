@@ -0,0 +1,22 @@
+class Stats:
+    """
+    Counters of a bulk operation.
+
+    Create an instance and pass it as `stats` to a bulk function:
+    the counters are filled in place while the operation runs.
+
+    `skipped` collects values which were not written because their rows
+    were locked by other transactions, see `lock` of bulky.update.
+    """
+
+    def __init__(self):
+        self.chunks = 0
+        self.retries = 0
+        self.deadlocks = 0
+        self.serialization_failures = 0
+        self.lock_failures = 0
+        self.skipped = []
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in sorted(vars(self).items()))
+        return f"{type(self).__name__}({fields})"
@@ -1,9 +1,22 @@
-from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Text, Union
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Text,
+    Tuple,
+    Union,
+)
 
 from sqlalchemy import Column, Table, text
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm import Mapper, Session, ColumnProperty
+from sqlalchemy.orm import Mapper, Query, Session, ColumnProperty
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.expression import SelectBase
 
 TableType = Union[Table, Mapper, DeclarativeMeta]
 TableColumnsSetType = FrozenSet[Text]
@@ -14,6 +27,8 @@ SessionType = Session
 
 ValuesType = Dict[ColumnType, Any]
 ValuesSeriesType = Sequence[ValuesType]
+InstanceType = Any  # an instance of a mapped class
+InstancesSeriesType = Sequence[InstanceType]
 CleanedValuesType = Dict[Text, Any]
 CleanedValuesSeriesType = Sequence[CleanedValuesType]
 
@@ -22,5 +37,15 @@ CleanReturningType = Sequence[text]
 
 ReferenceType = Iterable[ColumnType]
 
+ExpressionsType = Dict[ColumnType, Text]
+
 RowType = Any  # TODO: ResultProxy failed: mypy="invalid type" why ???
 RowsType = List[RowType]
+
+ScopeType = ClauseElement
+SyncResultType = Dict[Text, Union[int, RowsType]]
+
+KeysSeriesType = ValuesSeriesType
+SelectResultType = Union[Iterator[RowType], Dict[Tuple, RowType]]
+
+ExportSourceType = Union[Table, Mapper, DeclarativeMeta, SelectBase, Query]
@@ -13,7 +13,6 @@ setup(
         "License :: OSI Approved :: Apache Software License",
         "Operating System :: MacOS :: MacOS X",
         "Operating System :: POSIX :: Linux",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Topic :: Database",
         "Topic :: Software Development :: Libraries :: Python Modules",
@@ -30,5 +29,6 @@ setup(
         "Jinja2>=2.10.1",
         "typeguard>=2",
     ),
-    python_requires=">=3.6, <4",
+    extras_require={"parquet": ("pyarrow>=1",), "pipeline": ("psycopg>=3.1",)},
+    python_requires=">=3.7, <4",
 )
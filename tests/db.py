@@ -6,7 +6,7 @@ from dynaconf import settings
 from sqlalchemy import create_engine
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, relationship
 
 try:
     DATABASE_URL = settings.DATABASE_URL
@@ -33,6 +33,28 @@ class Model(Base):  # type: ignore
     v_numeric = sa.Column(sa.Numeric)
     v_text = sa.Column(sa.Text)
 
+    children = relationship("Child", backref="parent")
+
+
+class Child(Base):  # type: ignore
+    __tablename__ = "t_child"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    parent_id = sa.Column(sa.Integer, sa.ForeignKey(Model.id), nullable=False)
+
+    v_text = sa.Column(sa.Text)
+
+    toys = relationship("Toy")
+
+
+class Toy(Base):  # type: ignore
+    __tablename__ = "t_toy"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    child_id = sa.Column(sa.Integer, sa.ForeignKey(Child.id), nullable=False)
+
+    v_text = sa.Column(sa.Text)
+
 
 def get_engine():
     engine = create_engine(DATABASE_URL)
@@ -47,7 +69,8 @@ def drop_tables(engine):
     with closing(engine.connect()) as conn:
         conn = conn.execution_options(autocommit=True)
 
-        conn.execute(sa.text("DROP TABLE IF EXISTS {}".format(Model.__tablename__)))
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(sa.text("DROP TABLE IF EXISTS {}".format(table.name)))
 
 
 def db_setup():
@@ -104,4 +127,4 @@ class BulkyTest(unittest.TestCase):
         super().tearDown()
 
 
-__all__ = ("BulkyTest", "Model")
+__all__ = ("BulkyTest", "Child", "Model", "Toy", "get_engine")
@@ -0,0 +1,117 @@
+from contextlib import closing
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from bulky import bulk_load, insert
+from tests.db import *
+
+DDL_INDEXES_AND_CONSTRAINTS = (
+    f'CREATE INDEX bulky_ix_v_int ON "{Model.__tablename__}" (v_int)',
+    f'CREATE UNIQUE INDEX bulky_ux_v_text ON "{Model.__tablename__}" (v_text)',
+    f'ALTER TABLE "{Model.__tablename__}" ADD CONSTRAINT bulky_ck_v_int CHECK (v_int >= 0)',
+    f'ALTER TABLE "{Model.__tablename__}" ADD CONSTRAINT bulky_fk_v_int '
+    f'FOREIGN KEY (v_int) REFERENCES "{Model.__tablename__}" (id)',
+)
+
+STMT_INDEXES_AND_CONSTRAINTS = f"""
+SELECT indexname AS name FROM pg_indexes WHERE tablename = '{Model.__tablename__}'
+UNION ALL
+SELECT conname FROM pg_constraint WHERE conrelid = '"{Model.__tablename__}"'::regclass
+ORDER BY 1
+"""
+
+
+def get_indexes_and_constraints(session):
+    rows = session.execute(sa.text(STMT_INDEXES_AND_CONSTRAINTS)).fetchall()
+    return [row.name for row in rows]
+
+
+class BulkLoadTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        for ddl in DDL_INDEXES_AND_CONSTRAINTS:
+            self.session.execute(sa.text(ddl))
+
+    def test_bulk_load(self):
+        expected = get_indexes_and_constraints(self.session)
+
+        with bulk_load(self.session, Model):
+            self.assertEqual(
+                ["t_pkey", "t_pkey"],
+                get_indexes_and_constraints(self.session),
+                "indexes and constraints are not dropped",
+            )
+
+            insert(self.session, Model, [{Model.v_text: "a"}, {Model.v_text: "b"}])
+
+        self.assertEqual(expected, get_indexes_and_constraints(self.session))
+
+        with self.assertRaises(sa.exc.IntegrityError):
+            insert(self.session, Model, [{Model.v_text: "a"}])
+
+    def test_restore_on_failure(self):
+        expected = get_indexes_and_constraints(self.session)
+
+        with self.assertRaises(sa.exc.DataError):
+            with bulk_load(self.session, Model):
+                insert(self.session, Model, [{Model.v_int: 1}])
+                insert(self.session, Model, [{Model.v_int: "broken"}])
+
+        self.assertEqual(expected, get_indexes_and_constraints(self.session))
+
+        rows = self.session.execute(sa.select([Model.id])).fetchall()
+        self.assertFalse(rows, "data of failed load are kept")
+
+    def test_restore_fails_on_violation(self):
+        with self.assertRaises(sa.exc.IntegrityError):
+            with bulk_load(self.session, Model):
+                insert(self.session, Model, [{Model.v_int: -1}])
+
+
+class BulkLoadConcurrentlyTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        self.engine = get_engine()
+
+        with closing(self.engine.connect()) as conn:
+            with conn.begin():
+                for ddl in DDL_INDEXES_AND_CONSTRAINTS:
+                    conn.execute(sa.text(ddl))
+
+    def tearDown(self):
+        with closing(self.engine.connect()) as conn:
+            with conn.begin():
+                conn.execute(sa.delete(Model.__table__))
+                conn.execute(sa.text("DROP INDEX bulky_ix_v_int, bulky_ux_v_text"))
+                conn.execute(
+                    sa.text(
+                        f'ALTER TABLE "{Model.__tablename__}" '
+                        f"DROP CONSTRAINT bulky_ck_v_int, DROP CONSTRAINT bulky_fk_v_int"
+                    )
+                )
+
+        super().tearDown()
+
+    def test_concurrently(self):
+        session = Session(bind=self.engine)
+
+        try:
+            expected = get_indexes_and_constraints(session)
+
+            with bulk_load(session, Model, concurrently=True):
+                insert(session, Model, [{Model.v_text: "a"}])
+
+            self.assertEqual(expected, get_indexes_and_constraints(session))
+
+            rows = session.execute(
+                sa.text(
+                    "SELECT indisvalid FROM pg_index "
+                    "WHERE indexrelid = 'bulky_ix_v_int'::regclass"
+                )
+            ).fetchall()
+            self.assertEqual([(True,)], rows)
+        finally:
+            session.close()
@@ -0,0 +1,76 @@
+import uuid
+from datetime import date, datetime
+from enum import Enum
+
+from bulky import update
+from bulky.internals import encoders
+from tests.db import BulkyTest, Model
+
+
+class Color(Enum):
+    red = 1
+
+
+class EncodersTest(BulkyTest):
+    def test_builtin(self):
+        casts = (
+            ("text", "kek", "'kek'"),
+            ("text", "a'b", "'a''b'"),
+            ("text", "a\\b", "E'a\\\\b'"),
+            ("text", Color.red, "'red'"),
+            ("integer", 1, 1),
+            ("integer", True, 1),
+            ("boolean", True, "true"),
+            ("double precision", 1.5, 1.5),
+            ("double precision", float("nan"), "'NaN'"),
+            ("double precision", float("-inf"), "'-Infinity'"),
+            ("date", date(2020, 1, 2), "'2020-01-02'"),
+            (
+                "timestamp without time zone",
+                datetime(2020, 1, 2, 3, 4, 5),
+                "'2020-01-02T03:04:05'",
+            ),
+            (
+                "uuid",
+                uuid.UUID(int=1),
+                "'00000000-0000-0000-0000-000000000001'",
+            ),
+            ("bytea", b"\x00ab", "E'\\\\x006162'"),
+            ("jsonb", {"a": 'x"y'}, 'E\'{"a": "x\\\\"y"}\''),
+            ("hstore", {"a": 'x"y'}, 'E\'"a"=>"x\\\\"y"\''),
+            ("mood", Color.red, "'red'"),
+        )
+
+        for db_type, original, expected in casts:
+            got = encoders.get_encoder(db_type)(original)
+            self.assertEqual(
+                expected, got, f"encoder of {db_type} for {original!r} is wrong"
+            )
+
+    def test_register(self):
+        encoders.register_encoder("x_test", lambda value: f"'x{value}'")
+        try:
+            self.assertEqual("'x1'", encoders.get_encoder("x_test")(1))
+        finally:
+            del encoders._registry["x_test"]
+
+    def test_round_trip(self):
+        texts = ("a\\b", "it's", 'x"\\n"y', "\\x00")
+
+        objs = [Model(v_text="") for _ in texts]
+        self.session.add_all(objs)
+        self.session.flush()
+
+        update(
+            self.session,
+            Model,
+            [{"id": obj.id, "v_text": text} for obj, text in zip(objs, texts)],
+        )
+
+        self.session.expire_all()
+
+        got = [
+            row.v_text
+            for row in self.session.query(Model.v_text).order_by(Model.id).all()
+        ]
+        self.assertEqual(list(texts), got)
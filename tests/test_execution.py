@@ -0,0 +1,53 @@
+import threading
+import unittest
+
+from bulky import consts
+from bulky.internals import execution
+
+
+class PrefetchTest(unittest.TestCase):
+    longMessage = True
+
+    def test_order(self):
+        for depth in (0, 1, 3):
+            got = list(execution.prefetch(iter(range(10)), depth))
+            self.assertEqual(list(range(10)), got, f"order is broken, depth={depth}")
+
+    def test_producer_error(self):
+        def produce():
+            yield 1
+            yield 2
+            raise ZeroDivisionError()
+
+        got = []
+
+        with self.assertRaises(ZeroDivisionError):
+            for item in execution.prefetch(produce(), 2):
+                got.append(item)
+
+        self.assertEqual([1, 2], got, "items produced before error are lost")
+
+    def test_consumer_stops(self):
+        produced = []
+
+        def produce():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        threads = threading.active_count()
+
+        items = execution.prefetch(produce(), 2)
+        self.assertEqual(0, next(items))
+        items.close()
+
+        self.assertEqual(threads, threading.active_count(), "worker is not stopped")
+        self.assertLess(len(produced), 5, "producer is not bounded by depth")
+
+
+class BackoffTest(unittest.TestCase):
+    def test_get_backoff(self):
+        for attempt in range(10):
+            delay = execution.get_backoff(attempt)
+            self.assertGreater(delay, 0)
+            self.assertLessEqual(delay, consts.RETRY_BACKOFF_MAX * 1.5)
@@ -0,0 +1,131 @@
+import io
+import unittest
+
+import sqlalchemy as sa
+
+from bulky import export, insert
+from bulky.internals import copy
+from tests.db import *
+from tests.db import DATABASE_URL
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover
+    psycopg = None  # type: ignore
+
+
+class ExportTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        dataset = [
+            {Model.v_int: i, Model.v_text: f"a\tb\\{i}" if i % 2 else None}
+            for i in range(5)
+        ]
+        insert(self.session, Model, dataset)
+
+    def test_csv_file(self):
+        sink = io.BytesIO()
+
+        count = export(
+            self.session,
+            Model,
+            sink,
+            columns=[Model.v_int, Model.v_text],
+            header=True,
+        )
+        self.assertEqual(5, count)
+
+        lines = sink.getvalue().decode().splitlines()
+        self.assertEqual("v_int,v_text", lines[0])
+        self.assertEqual(6, len(lines))
+        self.assertIn("1,a\tb\\1", lines)
+
+    def test_text_file(self):
+        sink = io.StringIO()
+
+        export(self.session, Model, sink, format="text", columns=[Model.v_int])
+
+        self.assertEqual("0\n1\n2\n3\n4\n", sink.getvalue())
+
+    def test_callback(self):
+        chunks = []
+
+        count = export(self.session, Model, chunks.append, format="binary")
+
+        self.assertEqual(5, count)
+        self.assertTrue(b"".join(chunks).startswith(b"PGCOPY\n"))
+
+    def test_rows(self):
+        batches = []
+
+        query = (
+            sa.select([Model.v_int, Model.v_text])
+            .where(Model.v_int >= sa.bindparam("low", 1))
+            .order_by(Model.v_int)
+        )
+
+        count = export(self.session, query, batches.append, format="rows", batch_size=3)
+
+        self.assertEqual(4, count)
+        self.assertEqual([3, 1], [len(batch) for batch in batches])
+        self.assertEqual(
+            [("1", "a\tb\\1"), ("2", None), ("3", "a\tb\\3"), ("4", None)],
+            batches[0] + batches[1],
+        )
+
+    def test_query(self):
+        sink = io.BytesIO()
+
+        query = self.session.query(Model.v_int).filter(Model.v_text.like("a%"))
+        count = export(self.session, query, sink)
+
+        self.assertEqual(2, count)
+        self.assertEqual(b"1\n3\n", sink.getvalue())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            export(self.session, Model, io.BytesIO(), format="xml")
+
+        with self.assertRaises(ValueError):
+            export(self.session, Model, object())
+
+        with self.assertRaises(ValueError):
+            export(self.session, Model, io.StringIO(), format="binary")
+
+    def test_parse_text_row(self):
+        self.assertEqual(
+            ("a\nb", None, "", "c\\d"),
+            copy.parse_text_row("a\\nb\t\\N\t\tc\\\\d"),
+        )
+
+
+@unittest.skipUnless(psycopg, "psycopg 3 is not installed")
+class CopyPsycopg3Test(unittest.TestCase):
+    def test_copy_to(self):
+        with psycopg.connect(DATABASE_URL) as conn:
+            chunks = []
+
+            count = copy.copy_to(
+                conn, "COPY (SELECT generate_series(1, 3)) TO STDOUT", chunks.append
+            )
+
+            self.assertEqual(3, count)
+            self.assertEqual(b"1\n2\n3\n", b"".join(chunks))
+            self.assertEqual(
+                "SELECT 'x', 1",
+                copy.mogrify(conn, "SELECT %(a)s, %(b)s", {"a": "x", "b": 1}),
+            )
+
+    def test_copy_from(self):
+        with psycopg.connect(DATABASE_URL) as conn:
+            conn.execute("CREATE TEMPORARY TABLE c (v integer)")
+
+            count = copy.copy_from(
+                conn,
+                "COPY c (v) FROM STDIN WITH (FORMAT csv)",
+                [b"1\n2\n", b"", b"3\n"],
+            )
+
+            self.assertEqual(3, count)
+            self.assertEqual((6,), conn.execute("SELECT sum(v) FROM c").fetchone())
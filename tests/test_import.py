@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = (
+    "jinja2",
+    "psycopg",
+    "psycopg2",
+    "pyarrow",
+    "sqlalchemy",
+    "typeguard",
+)
+
+
+def get_imported_modules(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+
+    # line format: "import time: self [us] | cumulative | imported package"
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+class ImportTest(unittest.TestCase):
+    longMessage = True
+
+    def test_import_is_lazy(self):
+        modules = get_imported_modules("import bulky")
+
+        self.assertIn("bulky", modules)
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, modules, f"{module} is imported eagerly")
+
+    def test_attribute_access(self):
+        modules = get_imported_modules("import bulky; bulky.insert")
+
+        self.assertIn("bulky.functions.insert", modules)
+        self.assertIn("sqlalchemy", modules)
+        self.assertNotIn("bulky.functions.load_file", modules)
+        self.assertNotIn("psycopg", modules)
+        self.assertNotIn("pyarrow", modules)
+
+    def test_unknown_attribute(self):
+        import bulky
+
+        with self.assertRaises(AttributeError):
+            bulky.xxx
+
+        self.assertIn("update", dir(bulky))
@@ -124,3 +124,59 @@ class InsertTest(BulkyTest):
         self.assertEqual(
             row.v_default, 31337, f"wrong value in `{Model.v_default.key}` column"
         )
+
+    def test_instances(self):
+        objs = [Model(v_int=1), Model(v_int=2, v_text="x"), Model(id=100500)]
+
+        rows = insert(self.session, Model, objs, returning=[Model.id])
+        self.assertEqual(3, len(rows), "wrong amount of rows returned")
+
+        for obj in objs:
+            state = sa.inspect(obj)
+            self.assertTrue(obj.id, "primary key is not set back")
+            self.assertEqual(31337, obj.v_default, "default is not set back")
+            self.assertTrue(state.transient, "instance is attached")
+
+        self.assertEqual(100500, objs[2].id)
+
+        rows = self.session.execute(
+            sa.select([Model.id, Model.v_int, Model.v_text]).order_by(Model.id)
+        ).fetchall()
+        self.assertEqual(
+            [(obj.id, obj.v_int, obj.v_text) for obj in objs],
+            [tuple(row) for row in rows],
+        )
+
+    def test_instances_attach(self):
+        objs = [Model(v_int=1), Model(v_int=2)]
+
+        rows = insert(self.session, Model, objs, attach=True)
+        self.assertFalse(rows, "unexpected rows when no returning requested")
+
+        for obj in objs:
+            state = sa.inspect(obj)
+            self.assertTrue(state.persistent, "instance is not persistent")
+            self.assertIs(self.session, state.session)
+
+        self.assertFalse(self.session.new, "attached instances are pending")
+        self.assertFalse(self.session.dirty, "attached instances have changes")
+
+        self.assertIs(objs[0], self.session.query(Model).get(objs[0].id))
+
+    def test_errors_instances(self):
+        obj = Model()
+        self.session.add(obj)
+
+        with self.assertRaises(errors.InvalidValueError) as arc:
+            insert(self.session, Model, [obj])
+        self.assertEqual(
+            "invalid data in values_series[0]: instance is not transient",
+            str(arc.exception),
+        )
+
+        with self.assertRaises(errors.InvalidValueError) as arc:
+            insert(self.session, Model, [Model(), Child()])
+        self.assertEqual(
+            "invalid data in values_series[1]: instance is not mapped to t",
+            str(arc.exception),
+        )
@@ -0,0 +1,72 @@
+import sqlalchemy as sa
+
+from bulky import errors, insert_graph
+from tests.db import *
+
+
+class InsertGraphTest(BulkyTest):
+    def test_graph(self):
+        dataset = [
+            {
+                Model.v_int: 1,
+                Model.children: [
+                    {Child.v_text: "1.1", Child.toys: [{Toy.v_text: "1.1.1"}]},
+                    {Child.v_text: "1.2", "toys": []},
+                ],
+            },
+            {
+                Model.v_int: 2,
+                "children": [{Child.v_text: "2.1", Child.toys: None}],
+            },
+            {Model.v_int: 3, Model.children: []},
+        ]
+
+        rows = insert_graph(self.session, Model, dataset, [Model.id, Model.v_int])
+        self.assertEqual([1, 2, 3], sorted(row.v_int for row in rows))
+
+        query = (
+            sa.select([Model.v_int, Child.v_text, Toy.v_text.label("toy")])
+            .select_from(
+                sa.outerjoin(Model, Child, Child.parent_id == Model.id).outerjoin(
+                    Toy, Toy.child_id == Child.id
+                )
+            )
+            .order_by(Model.v_int, Child.v_text)
+        )
+        self.assertEqual(
+            [
+                (1, "1.1", "1.1.1"),
+                (1, "1.2", None),
+                (2, "2.1", None),
+                (3, None, None),
+            ],
+            [tuple(row) for row in self.session.execute(query).fetchall()],
+        )
+
+        ids = {row.v_int: row.id for row in rows}
+        parents = self.session.execute(sa.select([Child.parent_id, Child.v_text]))
+        self.assertEqual(
+            {"1.1": ids[1], "1.2": ids[1], "2.1": ids[2]},
+            {row.v_text: row.parent_id for row in parents},
+            "generated keys are propagated wrong",
+        )
+
+    def test_explicit_keys(self):
+        dataset = [{Model.id: 100500, Model.children: {Child.v_text: "x"}}]
+
+        insert_graph(self.session, Model, dataset)
+
+        rows = self.session.execute(sa.select([Child.parent_id])).fetchall()
+        self.assertEqual([(100500,)], rows)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            insert_graph(self.session, Model.__table__, [{Model.v_int: 1}])
+
+        with self.assertRaises(errors.InvalidColumnError) as arc:
+            insert_graph(self.session, Child, [{Child.v_text: "x", "parent": {}}])
+        self.assertEqual(
+            "invalid key `parent` in values_series[0]: "
+            "only one-to-many relationships are supported",
+            str(arc.exception),
+        )
@@ -0,0 +1,106 @@
+import os
+import tempfile
+from contextlib import closing
+from unittest import mock
+
+import sqlalchemy as sa
+from sqlalchemy.exc import DataError
+
+from bulky import (
+    FileCheckpointStore,
+    TableCheckpointStore,
+    consts,
+    insert_resumable,
+)
+from tests.db import *
+
+
+class InsertResumableTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = get_engine()
+
+    def tearDown(self):
+        with closing(self.engine.connect()) as conn:
+            with conn.begin():
+                conn.execute(sa.delete(Model.__table__))
+                conn.execute(
+                    sa.text(f"DROP TABLE IF EXISTS {consts.CHECKPOINTS_TABLE_NAME}")
+                )
+
+        self.tmpdir.cleanup()
+
+        super().tearDown()
+
+    def get_stores(self):
+        return (
+            FileCheckpointStore(os.path.join(self.tmpdir.name, "checkpoints.json")),
+            TableCheckpointStore(),
+        )
+
+    def get_committed(self):
+        with closing(self.engine.connect()) as conn:
+            rows = conn.execute(sa.select([Model.v_int])).fetchall()
+
+        return sorted(row.v_int for row in rows)
+
+    def test_insert(self):
+        dataset = [{Model.v_int: i} for i in range(10)]
+
+        for store in self.get_stores():
+            rows = insert_resumable(
+                self.engine, Model, dataset, store, returning=[Model.v_int]
+            )
+            self.assertEqual(list(range(10)), sorted(row.v_int for row in rows))
+
+            with closing(self.engine.connect()) as conn:
+                self.assertEqual(10, store.load(conn, Model.__tablename__))
+
+            rows = insert_resumable(
+                self.engine, Model, dataset, store, returning=[Model.v_int]
+            )
+            self.assertFalse(rows, "completed operation is run again")
+
+        self.assertEqual(sorted(list(range(10)) * 2), self.get_committed())
+
+    @mock.patch.object(consts, "BULK_CHUNK_SIZE", 2)
+    def test_resume_after_failure(self):
+        dataset_broken = [{Model.v_int: i} for i in range(10)]
+        dataset_broken[5] = {Model.v_int: "broken"}
+
+        dataset_fixed = [{Model.v_int: i} for i in range(10)]
+
+        for store in self.get_stores():
+            with closing(self.engine.connect()) as conn:
+                store.clear(conn, "job")
+
+            with self.assertRaises(DataError):
+                insert_resumable(
+                    self.engine, Model, dataset_broken, store, "job", commit_every=1
+                )
+
+            with closing(self.engine.connect()) as conn:
+                self.assertEqual(4, store.load(conn, "job"))
+
+            rows = insert_resumable(
+                self.engine,
+                Model,
+                dataset_fixed,
+                store,
+                "job",
+                commit_every=1,
+                returning=[Model.v_int],
+            )
+            self.assertEqual([4, 5, 6, 7, 8, 9], sorted(row.v_int for row in rows))
+
+        self.assertEqual(sorted(list(range(10)) * 2), self.get_committed())
+
+    def test_errors(self):
+        store = self.get_stores()[0]
+
+        with self.assertRaises(ValueError):
+            insert_resumable(
+                self.engine, Model, [{Model.v_int: 1}], store, commit_every=0
+            )
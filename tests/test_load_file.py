@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bulky import consts, errors, load_file
+from tests.db import *
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+
+class LoadFileTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        self._dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+        super().tearDown()
+
+    def write(self, name, content):
+        path = os.path.join(self._dir.name, name)
+
+        with open(path, "w") as file:
+            file.write(content)
+
+        return path
+
+    def fetch(self):
+        rows = self.session.query(Model.v_int, Model.v_text).order_by(Model.v_int).all()
+
+        return [tuple(row) for row in rows]
+
+    def test_csv(self):
+        path = self.write("data.csv", 'v_int,v_text\n1,a\n2,"b,c"\n3,\n')
+
+        result = load_file(self.session, Model, path)
+
+        self.assertEqual({"inserted": 3, "updated": 0, "deleted": 0}, result)
+        self.assertEqual([(1, "a"), (2, "b,c"), (3, None)], self.fetch())
+
+    @mock.patch.object(consts, "BULK_CHUNK_SIZE", 2)
+    def test_mapping(self):
+        path = self.write("data.csv", "num;skip;label\n1;x;a\n2;y;b\n3;z;c\n")
+
+        load_file(
+            self.session,
+            Model,
+            path,
+            mapping={"num": Model.v_int, "skip": None, "label": "v_text"},
+            delimiter=";",
+        )
+
+        self.assertEqual([(1, "a"), (2, "b"), (3, "c")], self.fetch())
+
+    def test_no_header(self):
+        path = self.write("data.csv", "1,a\n")
+
+        with self.assertRaises(ValueError):
+            load_file(self.session, Model, path, header=False)
+
+        load_file(self.session, Model, path, columns=["v_int", "v_text"], header=False)
+
+        self.assertEqual([(1, "a")], self.fetch())
+
+    def test_unknown_column(self):
+        path = self.write("data.csv", "v_int,xxx\n1,a\n")
+
+        with self.assertRaises(errors.InvalidColumnError):
+            load_file(self.session, Model, path)
+
+    def test_upsert(self):
+        load_file(self.session, Model, self.write("a.csv", "v_int,v_text\n1,a\n2,b\n"))
+
+        path = self.write("b.csv", "v_int,v_text\n1,a\n2,x\n3,c\n")
+
+        result = load_file(self.session, Model, path, reference=[Model.v_int])
+
+        self.assertEqual({"inserted": 1, "updated": 1, "deleted": 0}, result)
+        self.assertEqual([(1, "a"), (2, "x"), (3, "c")], self.fetch())
+
+        with self.assertRaises(ValueError):
+            load_file(self.session, Model, path, reference=[Model.v_bool])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_parquet(self):
+        path = os.path.join(self._dir.name, "data.parquet")
+
+        data = pyarrow.table(
+            {"n": [1, 2, 3, 4], "v_text": ["a", None, "", "d"], "extra": [0] * 4}
+        )
+        pyarrow.parquet.write_table(data, path, row_group_size=3)
+
+        result = load_file(
+            self.session, Model, path, columns=["n", "v_text"], mapping={"n": "v_int"}
+        )
+
+        self.assertEqual(4, result["inserted"])
+        self.assertEqual([(1, "a"), (2, None), (3, ""), (4, "d")], self.fetch())
@@ -0,0 +1,98 @@
+import unittest
+from contextlib import closing
+
+import sqlalchemy as sa
+
+from bulky import errors, insert, update
+from bulky.internals import execution, pipeline
+from tests.db import *
+from tests.db import DATABASE_URL
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover
+    psycopg = None  # type: ignore
+
+
+@unittest.skipUnless(psycopg, "psycopg 3 is not installed")
+class PipelineTest(unittest.TestCase):
+    longMessage = True
+
+    def setUp(self):
+        super().setUp()
+
+        self.conn = psycopg.connect(DATABASE_URL)
+        self.conn.execute("CREATE TEMPORARY TABLE p (v integer CHECK (v >= 0))")
+
+    def tearDown(self):
+        self.conn.rollback()
+        self.conn.close()
+
+        super().tearDown()
+
+    def test_is_supported(self):
+        self.assertTrue(pipeline.is_supported(self.conn))
+        self.assertFalse(pipeline.is_supported(object()))
+
+    def test_execute_pipelined(self):
+        statements = [
+            ("INSERT INTO p (v) VALUES (%(v)s) RETURNING v", {"v": i})
+            for i in range(10)
+        ]
+
+        results = list(
+            pipeline.execute_pipelined(self.conn, statements, fetch=True, depth=3)
+        )
+        self.assertEqual([[(i,)] for i in range(10)], results)
+
+        results = list(
+            pipeline.execute_pipelined(
+                self.conn, [("UPDATE p SET v = v + 1", None)], fetch=False
+            )
+        )
+        self.assertEqual([[]], results)
+
+        with closing(self.conn.cursor()) as cursor:
+            cursor.execute("SELECT sum(v) FROM p")
+            self.assertEqual((55,), cursor.fetchone(), "not in the same transaction")
+
+    def test_compiled_statements(self):
+        table = sa.Table("p", sa.MetaData(), sa.Column("v", sa.Integer))
+        query = sa.insert(table, values=[{"v": 1}, {"v": 2}], returning=[table.c.v])
+
+        with closing(get_engine().connect()) as conn:
+            statements = [
+                execution.compile_statement(conn, query),
+                execution.compile_statement(conn, "SELECT sum(v) FROM p"),
+            ]
+
+        results = list(pipeline.execute_pipelined(self.conn, statements, fetch=True))
+        self.assertEqual([[(1,), (2,)], [(3,)]], results)
+
+    def test_error_is_reported_against_chunk(self):
+        statements = [
+            (f"INSERT INTO p (v) VALUES ({v}) RETURNING v", None)
+            for v in (1, 2, -3, 4, 5)
+        ]
+
+        with self.assertRaises(errors.ChunkExecutionError) as arc:
+            list(pipeline.execute_pipelined(self.conn, statements, True, depth=4))
+        self.assertTrue(str(arc.exception).startswith("failed to execute chunk[2]: "))
+        self.assertIsInstance(arc.exception.__cause__, psycopg.errors.CheckViolation)
+
+
+class PipelineFallbackTest(BulkyTest):
+    def test_fallback(self):
+        rows = insert(
+            self.session, Model, [{Model.v_int: 1}], [Model.id], pipeline=True
+        )
+        self.assertEqual(1, len(rows))
+
+        rows = update(
+            self.session,
+            Model,
+            [{Model.id: rows[0].id, Model.v_int: 2}],
+            returning=[Model.v_int],
+            pipeline=True,
+        )
+        self.assertEqual([(2,)], [tuple(row) for row in rows])
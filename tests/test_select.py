@@ -0,0 +1,66 @@
+from unittest import mock
+
+from bulky import consts, errors, insert, select
+from tests.db import *
+
+
+class SelectTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        dataset = [{Model.v_int: i % 3, Model.v_text: str(i)} for i in range(9)]
+        self.rows = insert(self.session, Model, dataset, [Model.id, Model.v_text])
+
+    @mock.patch.object(consts, "BULK_CHUNK_SIZE", 2)
+    def test_select(self):
+        ids = sorted(row.id for row in self.rows)[:5]
+
+        rows = select(self.session, Model, [{Model.id: i} for i in ids + [-1]])
+        rows = list(rows)
+
+        self.assertEqual(ids, sorted(row.id for row in rows))
+        self.assertEqual(
+            len(Model.__table__.columns), len(rows[0]), "not all columns fetched"
+        )
+
+    def test_composite_reference(self):
+        keys = [
+            {Model.v_int: 1, Model.v_text: "1"},
+            {Model.v_int: 1, Model.v_text: "4"},
+            {Model.v_int: 2, Model.v_text: "4"},
+        ]
+
+        rows = select(
+            self.session,
+            Model,
+            keys,
+            reference=[Model.v_int, Model.v_text],
+            columns=[Model.v_text],
+        )
+        self.assertEqual(["1", "4"], sorted(row.v_text for row in rows))
+
+    def test_as_dict(self):
+        keys = [{Model.v_text: "1"}, {Model.v_text: "2"}]
+
+        result = select(
+            self.session,
+            Model,
+            keys,
+            reference=[Model.v_text],
+            columns=[Model.v_int],
+            as_dict=True,
+        )
+        self.assertEqual(
+            {("1",): 1, ("2",): 2}, {k: r.v_int for k, r in result.items()}
+        )
+
+    def test_empty(self):
+        self.assertEqual([], list(select(self.session, Model, [])))
+        self.assertEqual({}, select(self.session, Model, [], as_dict=True))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            select(self.session, Model, [{Model.v_int: 1}])
+
+        with self.assertRaises(errors.InvalidColumnError):
+            select(self.session, Model, [{Model.id: 1}], columns=["unknown_column"])
@@ -0,0 +1,94 @@
+import sqlalchemy as sa
+
+from bulky import consts, errors, sync
+from tests.db import *
+
+
+class SyncTest(BulkyTest):
+    def setUp(self):
+        super().setUp()
+
+        self.objs = [Model(v_int=i, v_text=str(i)) for i in range(4)]
+        self.session.add_all(self.objs)
+        self.session.flush()
+
+    def get_table_state(self):
+        rows = self.session.execute(
+            sa.select([Model.v_int, Model.v_text, Model.v_default])
+        ).fetchall()
+        return sorted(tuple(row) for row in rows)
+
+    def test_sync(self):
+        dataset = [
+            {Model.v_int: 0, Model.v_text: "0"},
+            {Model.v_int: 1, Model.v_text: "one"},
+            {Model.v_int: 10, Model.v_text: "10"},
+        ]
+
+        result = sync(self.session, Model, dataset, reference=[Model.v_int])
+        self.assertDictEqual(
+            {consts.SYNC_INSERTED: 1, consts.SYNC_UPDATED: 1, consts.SYNC_DELETED: 2},
+            result,
+        )
+        self.assertEqual(
+            [(0, "0", 31337), (1, "one", 31337), (10, "10", 31337)],
+            self.get_table_state(),
+        )
+
+        result = sync(self.session, Model, dataset, reference=[Model.v_int])
+        self.assertDictEqual(
+            {consts.SYNC_INSERTED: 0, consts.SYNC_UPDATED: 0, consts.SYNC_DELETED: 0},
+            result,
+            "sync of the same values",
+        )
+
+    def test_returning(self):
+        dataset = [
+            {Model.id: self.objs[0].id, Model.v_text: "zero"},
+            {Model.id: self.objs[1].id, Model.v_text: "1"},
+        ]
+
+        result = sync(self.session, Model, dataset, returning=[Model.v_int])
+        self.assertEqual([0], [row.v_int for row in result[consts.SYNC_UPDATED]])
+        self.assertEqual([], result[consts.SYNC_INSERTED])
+        self.assertEqual(
+            [2, 3], sorted(row.v_int for row in result[consts.SYNC_DELETED])
+        )
+
+    def test_scope_and_no_delete(self):
+        dataset = [{Model.v_int: 0, Model.v_text: "0"}]
+
+        result = sync(
+            self.session,
+            Model,
+            dataset,
+            reference=[Model.v_int],
+            scope=Model.v_int < 2,
+        )
+        self.assertEqual(1, result[consts.SYNC_DELETED])
+        self.assertEqual([0, 2, 3], [row[0] for row in self.get_table_state()])
+
+        dataset = [{Model.v_int: 5, Model.v_text: "5"}]
+
+        result = sync(
+            self.session, Model, dataset, reference=[Model.v_int], delete_missing=False
+        )
+        self.assertEqual(1, result[consts.SYNC_INSERTED])
+        self.assertEqual(0, result[consts.SYNC_DELETED])
+        self.assertEqual([0, 2, 3, 5], [row[0] for row in self.get_table_state()])
+
+    def test_non_comparable_types(self):
+        dataset = [
+            {Model.v_int: 0, Model.v_array: ["a"]},
+            {Model.v_int: 1, Model.v_array: None},
+        ]
+
+        result = sync(self.session, Model, dataset, reference=[Model.v_int])
+        self.assertEqual(1, result[consts.SYNC_UPDATED])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            sync(self.session, Model, [{Model.v_text: "x"}], reference=[Model.v_int])
+
+        with self.assertRaises(errors.InvalidColumnError):
+            sync(self.session, Model, [{"unknown_column": 1}])
@@ -1,11 +1,18 @@
+import unittest
+from contextlib import closing
 from datetime import datetime
 from decimal import Decimal
+from unittest import mock
 
+import sqlalchemy as sa
 from jinja2 import Template
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
 
-from bulky import update
+from bulky import Stats, consts, errors, expressions, update
 from bulky.types import ReferenceType
 from .db import *
+from .db import db_setup, db_teardown
 
 
 class UpdateTest(BulkyTest):
@@ -77,6 +84,179 @@ class UpdateTest(BulkyTest):
         r = update(self.session, Model, [dataset], returning=[Model.id])
         self.assertEqual(len(r), 0, "update of the same value")
 
+    def test_ordered(self):
+        objs = [Model() for _ in range(3)]
+        self.session.add_all(objs)
+        self.session.flush()
+
+        dataset = [{Model.id: obj.id, Model.v_int: obj.id} for obj in reversed(objs)]
+
+        r = update(self.session, Model, dataset, returning=[Model.id], ordered=True)
+        self.assertEqual(len(r), len(objs))
+
+        for obj in objs:
+            self.session.refresh(obj)
+            self.assertEqual(obj.v_int, obj.id, "ordered update mismatch")
+
+    def test_retry_on_deadlock(self):
+        self.inject_failures(consts.PGCODE_DEADLOCK_DETECTED, 2)
+
+        dataset = {Model.id: self.obj.id, Model.v_int: 42}
+        stats = Stats()
+
+        r = update(
+            self.session,
+            Model,
+            [dataset],
+            returning=[Model.id],
+            retries=2,
+            stats=stats,
+        )
+        self.assertEqual(len(r), 1, "chunk is not updated after retries")
+        self.assertEqual(stats.chunks, 1)
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.deadlocks, 2)
+        self.assertEqual(stats.serialization_failures, 0)
+
+    def test_retry_exhausted(self):
+        self.inject_failures(consts.PGCODE_SERIALIZATION_FAILURE, 2)
+
+        dataset = {Model.id: self.obj.id, Model.v_int: 42}
+        stats = Stats()
+
+        with self.assertRaises(DBAPIError) as arc:
+            update(self.session, Model, [dataset], retries=1, stats=stats)
+        self.assertEqual(arc.exception.orig.pgcode, consts.PGCODE_SERIALIZATION_FAILURE)
+        self.assertEqual(stats.retries, 1)
+        self.assertEqual(stats.serialization_failures, 1)
+
+        # transaction is still usable after the failed chunk
+        self.session.refresh(self.obj)
+        self.assertIsNone(self.obj.v_int)
+
+    def test_instances(self):
+        self.obj.v_int = 42
+        self.obj.v_text = "instance"
+
+        r = update(self.session, Model, [self.obj], returning=[Model.v_text])
+        self.assertEqual(["instance"], [row.v_text for row in r])
+        self.assertFalse(
+            self.session.is_modified(self.obj), "updated instance has changes"
+        )
+
+        row = self.session.execute(
+            sa.select([Model.v_int, Model.v_text]).where(Model.id == self.obj.id)
+        ).fetchone()
+        self.assertEqual((42, "instance"), tuple(row))
+
+    def test_expressions(self):
+        self.obj.v_int = 5
+        self.obj.v_array = ["a"]
+        self.obj.v_text = "keep"
+        self.session.flush()
+
+        dataset = {
+            Model.id: self.obj.id,
+            Model.v_int: 3,
+            Model.v_array: ["b", "c"],
+            Model.v_text: None,
+        }
+        update_expressions = {
+            Model.v_int: expressions.INCREMENT,
+            Model.v_array: expressions.APPEND,
+            "v_text": expressions.COALESCE,
+        }
+
+        r = update(
+            self.session,
+            Model,
+            [dataset],
+            returning=[Model.v_int, Model.v_array, Model.v_text],
+            expressions=update_expressions,
+        )
+        self.assertEqual([(8, ["a", "b", "c"], "keep")], [tuple(row) for row in r])
+
+        dataset = {Model.id: self.obj.id, Model.v_int: 0}
+        r = update(
+            self.session,
+            Model,
+            [dataset],
+            returning=[Model.id],
+            expressions={Model.v_int: expressions.INCREMENT},
+        )
+        self.assertEqual(len(r), 0, "update of the same value")
+
+        dataset = {Model.id: self.obj.id, Model.v_int: 1}
+        r = update(
+            self.session,
+            Model,
+            [dataset],
+            returning=[Model.v_int],
+            expressions={Model.v_int: expressions.GREATEST},
+        )
+        self.assertEqual(len(r), 0, "update of the same value")
+
+    def test_expressions_errors(self):
+        dataset = {Model.id: self.obj.id, Model.v_int: 3}
+
+        with self.assertRaises(ValueError):
+            update(
+                self.session,
+                Model,
+                [dataset],
+                expressions={Model.v_text: expressions.COALESCE},
+            )
+
+    @mock.patch.object(consts, "BULK_CHUNK_SIZE", 2)
+    def test_prefetch(self):
+        objs = [Model() for _ in range(5)]
+        self.session.add_all(objs)
+        self.session.flush()
+
+        dataset = [{Model.id: obj.id, Model.v_int: obj.id} for obj in objs]
+        stats = Stats()
+
+        r = update(
+            self.session,
+            Model,
+            dataset,
+            returning=[Model.id, Model.v_int],
+            stats=stats,
+            prefetch=2,
+        )
+        self.assertEqual(sorted((obj.id, obj.id) for obj in objs), sorted(r))
+        self.assertEqual(3, stats.chunks)
+
+        dataset[3] = {Model.id: objs[3].id}
+
+        with self.assertRaises(errors.InvalidValueError) as arc:
+            update(self.session, Model, dataset, prefetch=2)
+        self.assertEqual(
+            "invalid data in values_series[3]: keys mismatch: excess=[], missing=['v_int']",
+            str(arc.exception),
+        )
+
+    def inject_failures(self, pgcode, times):
+        """
+        Makes the first `times` updates of the table fail with given error code
+        """
+
+        self.session.execute(sa.text("CREATE TEMPORARY SEQUENCE bulky_failures"))
+        self.session.execute(sa.text(f"""
+                CREATE FUNCTION pg_temp.bulky_fail() RETURNS trigger AS $$
+                BEGIN
+                    IF nextval('bulky_failures') <= {times} THEN
+                        RAISE EXCEPTION 'injected failure' USING ERRCODE = '{pgcode}';
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+                """))
+        self.session.execute(sa.text(f"""
+                CREATE TRIGGER bulky_fail BEFORE UPDATE ON "{Model.__tablename__}"
+                FOR EACH STATEMENT EXECUTE PROCEDURE pg_temp.bulky_fail()
+                """))
+
     def update_and_validate(
         self, dataset, returning=None, references: ReferenceType = ("id",)
     ):
@@ -118,3 +298,115 @@ class UpdateTest(BulkyTest):
         self.assertFalse(mismatches, tmpl.render(mismatches=mismatches, type=type))
 
         return r
+
+
+class UpdateLockTest(unittest.TestCase):
+    """
+    Rows are committed, so that they can be locked by another connection.
+    """
+
+    longMessage = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        db_setup()
+
+    @classmethod
+    def tearDownClass(cls):
+        db_teardown()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
+        self.engine = get_engine()
+
+        with closing(self.engine.connect()) as conn:
+            conn.execute(sa.delete(Model.__table__))
+            rows = conn.execute(
+                sa.insert(
+                    Model.__table__,
+                    values=[{"v_int": i} for i in range(4)],
+                    returning=[Model.id],
+                )
+            )
+            self.ids = sorted(row.id for row in rows)
+
+        # locks the second row until the end of test
+        blocker = self.engine.connect()
+        self.addCleanup(blocker.close)
+        self.addCleanup(blocker.begin().rollback)
+        blocker.execute(
+            sa.select([Model.id]).where(Model.id == self.ids[1]).with_for_update()
+        )
+
+        connection = self.engine.connect()
+        self.addCleanup(connection.close)
+        self.addCleanup(connection.begin().rollback)
+        self.session = Session(bind=connection)
+
+    @mock.patch.object(consts, "BULK_CHUNK_SIZE", 3)
+    def test_skip_locked(self):
+        dataset = [{Model.id: i, Model.v_int: 100} for i in self.ids + [-1]]
+        stats = Stats()
+
+        r = update(
+            self.session,
+            Model,
+            dataset,
+            returning=[Model.id],
+            stats=stats,
+            lock=consts.LOCK_SKIP_LOCKED,
+        )
+
+        self.assertEqual(
+            sorted(set(self.ids) - {self.ids[1]}), sorted(row.id for row in r)
+        )
+        self.assertEqual([dataset[1]], stats.skipped, "locked row is not skipped")
+        self.assertEqual(2, stats.chunks)
+
+    def test_skip_locked_instances(self):
+        objs = self.session.query(Model).order_by(Model.id).all()
+        for obj in objs:
+            obj.v_int = 100
+
+        stats = Stats()
+
+        update(self.session, Model, objs, stats=stats, lock=consts.LOCK_SKIP_LOCKED)
+
+        self.assertEqual([objs[1]], stats.skipped)
+        self.assertTrue(self.session.is_modified(objs[1]), "skipped instance is saved")
+        self.assertFalse(self.session.is_modified(objs[0]))
+
+    def test_nowait(self):
+        dataset = [{Model.id: i, Model.v_int: 100} for i in self.ids]
+        stats = Stats()
+
+        with self.assertRaises(DBAPIError) as arc:
+            update(
+                self.session,
+                Model,
+                dataset,
+                retries=1,
+                stats=stats,
+                lock=consts.LOCK_NOWAIT,
+            )
+
+        self.assertEqual(consts.PGCODE_LOCK_NOT_AVAILABLE, arc.exception.orig.pgcode)
+        self.assertEqual(1, stats.lock_failures)
+
+    def test_invalid(self):
+        dataset = [{Model.id: self.ids[0], Model.v_int: 1}]
+
+        with self.assertRaises(ValueError):
+            update(self.session, Model, dataset, lock="xxx")
+
+        with self.assertRaises(ValueError):
+            update(
+                self.session,
+                Model,
+                dataset,
+                lock=consts.LOCK_NOWAIT,
+                pipeline=True,
+            )